@@ -0,0 +1,73 @@
+# Offline benchmarks; run each one with `python -m benchmarks.<name>`.
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DASHBOARD_WARMUP for each mode of the app's background warmup
+WARMUP_MODES = {"off": "0", "on": "1"}
+
+
+# Nearest-rank percentile of a list of samples
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+# Wall time of one call to `call`, in ms
+def timed(call):
+    start = time.perf_counter()
+    call()
+    return (time.perf_counter() - start) * 1000
+
+
+# Call `call` on `sessions` threads released together, like that many
+# sessions arriving at once; returns (per-session results, errors raised)
+def burst(call, sessions):
+    barrier = threading.Barrier(sessions)
+    results = [None] * sessions
+    errors = []
+
+    def session(i):
+        barrier.wait()
+        try:
+            results[i] = call()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def add_warmup_argument(parser):
+    parser.add_argument(
+        "--warmup", choices=["on", "off", "both"], default="both",
+        help="time the app with its background warmup on (the default in production), off, or both",
+    )
+
+
+# Re-run `python -m <module> <argv>` once per warmup mode, each in a fresh
+# interpreter so one mode's warm caches don't leak into the other; returns
+# {mode: the JSON that run wrote}
+def run_each_warmup_mode(module, argv):
+    results = {}
+    for mode in WARMUP_MODES:
+        print(f"--- warmup {mode} ---", flush=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            subprocess.run(
+                [sys.executable, "-m", module, *argv, "--warmup", mode, "--json", path],
+                cwd=REPO_ROOT, check=True,
+            )
+            with open(path) as f:
+                results[mode] = json.load(f)
+    return results
@@ -0,0 +1,148 @@
+"""Headless end-to-end benchmark of every section of app1.py.
+
+Drives the app with streamlit's AppTest against the local stand-in backend.
+For every sidebar section it times the first visit, then every selectbox
+value on the page (or plain reruns for pages without one), and reports
+p50/p95 rerun latency. A second pass under tracemalloc records the peak
+Python heap used while rendering each section.
+
+Results are written as JSON together with the git commit they were taken
+at; pass an earlier file to --compare to see what changed. By default every
+section is timed twice, each pass in a fresh process: with the app's
+background warmup off and with it on, as it runs in production. --warmup
+picks one.
+
+    python -m benchmarks.bench_app --json bench/app-$(git rev-parse --short HEAD).json
+    python -m benchmarks.bench_app --compare bench/app-abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from benchmarks import REPO_ROOT, WARMUP_MODES, add_warmup_argument, percentile, run_each_warmup_mode, timed
+
+SECTIONS = ["Home", "Heatmap Overview", "Category Analytics", "Negotiated Type Breakdown"]
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+# Visit `section` in a fresh session, then exercise every selectbox value on
+# it (or rerun it `repeats` times). Returns (first_visit_ms, rerun samples).
+def drive_section(section, repeats):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app1.py"), default_timeout=300)
+    at.run()
+    first_visit_ms = timed(at.sidebar.radio[0].set_value(section).run)
+    if at.exception:
+        raise RuntimeError(f"{section} raised: {at.exception[0].value}")
+
+    samples = []
+    if len(at.selectbox):
+        for option in list(at.selectbox[0].options):
+            samples.append(timed(at.selectbox[0].select(option).run))
+    else:
+        for _ in range(repeats):
+            samples.append(timed(at.run))
+    return first_visit_ms, samples
+
+
+def peak_memory(section, repeats):
+    tracemalloc.start()
+    try:
+        drive_section(section, repeats)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(results, baseline_path):
+    # Results from before the warmup column were always taken with it off
+    with open(baseline_path) as f:
+        baseline = {(s["section"], s.get("warmup", "off")): s for s in json.load(f)["sections"]}
+    print(f"\nvs {baseline_path}:")
+    for current in results["sections"]:
+        before = baseline.get((current["section"], current["warmup"]))
+        if before is None:
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms", "peak_memory_bytes"):
+            if before[key]:
+                changes.append(f"{key} {100 * (current[key] - before[key]) / before[key]:+.1f}%")
+        print(f"  {current['section']:<28} warmup {current['warmup']:<3}  " + "   ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic rows in the local database")
+    parser.add_argument("--repeats", type=int, default=20, help="reruns for pages without a selectbox")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    add_warmup_argument(parser)
+    args = parser.parse_args()
+
+    if args.warmup == "both":
+        runs = run_each_warmup_mode("benchmarks.bench_app", ["--rows", str(args.rows), "--repeats", str(args.repeats)])
+        results = dict(runs["off"], sections=[s for run in runs.values() for s in run["sections"]])
+        write_results(results, args)
+        return
+
+    os.environ.setdefault("DASHBOARD_BACKEND", "local")
+    os.environ.setdefault("DASHBOARD_LOCAL_ROWS", str(args.rows))
+    os.environ["DASHBOARD_WARMUP"] = WARMUP_MODES[args.warmup]
+
+    # Seed up front so the first section's timings don't include it
+    from dashboard.backends import get_backend
+
+    get_backend().connect().close()
+
+    sections = []
+    for section in SECTIONS:
+        first_visit_ms, samples = drive_section(section, args.repeats)
+        result = {
+            "section": section,
+            "warmup": args.warmup,
+            "first_visit_ms": first_visit_ms,
+            "reruns": len(samples),
+            "p50_ms": statistics.median(samples),
+            "p95_ms": percentile(samples, 95),
+            "peak_memory_bytes": peak_memory(section, args.repeats),
+        }
+        sections.append(result)
+        print(f"{section:<28} first {first_visit_ms:8.1f} ms   p50 {result['p50_ms']:7.1f} ms"
+              f"   p95 {result['p95_ms']:7.1f} ms   peak {result['peak_memory_bytes'] / 2**20:7.1f} MB"
+              f"   ({len(samples)} reruns)")
+
+    results = {
+        "commit": git_commit(),
+        "taken_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "backend": os.environ["DASHBOARD_BACKEND"],
+        "rows": args.rows,
+        "sections": sections,
+    }
+    write_results(results, args)
+
+
+def write_results(results, args):
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Sequential vs concurrent execution of a page's independent statements.
+
+Uses the three statements the Category Analytics page used to issue one
+after another on a single cursor (national aggregate, DISTINCT STATE,
+per-state breakdown) against the local stand-in backend. Each round runs
+them back to back and then all at once through dashboard.executor, and
+reports the sum and max of the individual latencies next to the concurrent
+wall time.
+
+    python -m benchmarks.bench_concurrency
+    python -m benchmarks.bench_concurrency --rows 20000000 --engine duckdb
+"""
+import argparse
+import json
+import statistics
+
+from benchmarks import timed
+from dashboard.backends import local_backend
+from dashboard.executor import gather, run_statement
+from dashboard.pool import ConnectionPool
+from dashboard.statements import statements
+
+NATIONAL = statements.register("bench_category_national", """
+    SELECT STATE, CATEGORY, COUNT(*) AS CATEGORY_COUNT
+    FROM ALL_STATE_COMBINED
+    WHERE STATE IS NOT NULL AND CATEGORY IS NOT NULL
+    GROUP BY STATE, CATEGORY
+""", ["STATE", "CATEGORY", "CATEGORY_COUNT"])
+STATES = statements.register("bench_distinct_state", """
+    SELECT DISTINCT STATE FROM ALL_STATE_COMBINED WHERE STATE IS NOT NULL ORDER BY STATE
+""", ["STATE"])
+PER_STATE = statements.register("bench_category_per_state", """
+    SELECT CATEGORY, COUNT(*) AS CATEGORY_COUNT
+    FROM ALL_STATE_COMBINED
+    WHERE STATE = ? AND CATEGORY IS NOT NULL
+    GROUP BY CATEGORY
+    ORDER BY CATEGORY_COUNT DESC
+""", ["CATEGORY", "CATEGORY_COUNT"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000, help="synthetic rows if the database is empty")
+    parser.add_argument("--engine", choices=["duckdb", "sqlite"])
+    parser.add_argument("--path")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    backend = local_backend(engine=args.engine, path=args.path)
+    backend.seed_rows = args.rows
+    pool = ConnectionPool(backend.connect, size=3)
+    requests = [(NATIONAL, None), (STATES, None), (PER_STATE, ("California",))]
+    calls = [lambda s=s, p=p: run_statement(pool, s, p) for s, p in requests]
+
+    # Open all three connections and warm the engine's page cache
+    gather(calls)
+
+    rounds = []
+    for _ in range(args.rounds):
+        individual = [timed(call) for call in calls]
+        concurrent = timed(lambda: gather(calls))
+        rounds.append({"sum_ms": sum(individual), "max_ms": max(individual), "concurrent_ms": concurrent})
+
+    summary = {key: statistics.median(r[key] for r in rounds) for key in ("sum_ms", "max_ms", "concurrent_ms")}
+    print(f"{backend.name}: sequential {summary['sum_ms']:.1f} ms   slowest statement {summary['max_ms']:.1f} ms"
+          f"   concurrent {summary['concurrent_ms']:.1f} ms   (median of {args.rounds} rounds)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": backend.name, "rounds": rounds, "median": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Long pandas cube vs dense NumPy cube for the reshapes the pages do.
+
+Aggregates a synthetic ALL_STATE_COMBINED (dashboard.synthetic) in an
+in-memory SQLite database into the cube frame, then times both ways of
+producing what Negotiated Type Breakdown shows:
+
+    pandas: by_state_category_type() + pivot_table for the national map,
+            StateIndex slice + pivot for each state's drill-down
+    dense:  DenseCube.types_by_state() and DenseCube.type_pivot(state)
+
+and reports the memory each representation holds.
+
+    python -m benchmarks.bench_cube
+    python -m benchmarks.bench_cube --rows 5000000 --repeats 50 --json cube.json
+"""
+import argparse
+import json
+import sqlite3
+import statistics
+
+from benchmarks import timed
+from dashboard.cube import CUBE, AggregateCube
+from dashboard.dense_cube import DenseCube
+from dashboard.fetch import rows_to_frame
+from dashboard.slicing import StateIndex
+from dashboard.synthetic import seed_rows
+
+
+# Median wall time of `repeats` calls to `fn`, in ms
+def median_ms(fn, repeats):
+    return statistics.median(timed(fn) for _ in range(repeats))
+
+
+def cube_frame(rows, seed):
+    conn = sqlite3.connect(":memory:")
+    seed_rows(conn, rows, seed)
+    return rows_to_frame(conn.execute(CUBE.sql).fetchall(), CUBE.columns)
+
+
+def pandas_national(cube):
+    return cube.by_state_category_type().pivot_table(
+        index="STATE", columns="NEGOTIATED_TYPE", values="TYPE_COUNT", aggfunc="sum", observed=True
+    ).fillna(0).astype(int).reset_index()
+
+
+def pandas_drilldowns(index):
+    for state in index.states():
+        index.slice(state).pivot(index="CATEGORY", columns="NEGOTIATED_TYPE", values="TYPE_COUNT").fillna(0).astype(int)
+
+
+def dense_drilldowns(dense, states):
+    for state in states:
+        dense.type_pivot(state)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic raw rows to aggregate")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    frame = cube_frame(args.rows, args.seed)
+    cube = AggregateCube(frame)
+    index = StateIndex(cube.by_state_category_type(), sort_by=["CATEGORY", "NEGOTIATED_TYPE"])
+    states = index.states()
+
+    build_ms = median_ms(lambda: DenseCube.from_frame(frame), args.repeats)
+    dense = DenseCube.from_frame(frame)
+    long_bytes = int(frame.memory_usage(deep=True).sum())
+    index_bytes = sum(int(s.memory_usage(deep=True).sum()) for s in index._slices.values())
+
+    results = {
+        "rows": args.rows,
+        "cube_rows": len(frame),
+        "dense_shape": list(dense.counts.shape),
+        "memory_bytes": {"pandas_long": long_bytes, "pandas_state_index": index_bytes, "dense": dense.memory_usage()},
+        "dense_build_ms": build_ms,
+        "national_ms": {
+            "pandas": median_ms(lambda: pandas_national(cube), args.repeats),
+            "dense": median_ms(dense.types_by_state, args.repeats),
+        },
+        "all_drilldowns_ms": {
+            "pandas": median_ms(lambda: pandas_drilldowns(index), args.repeats),
+            "dense": median_ms(lambda: dense_drilldowns(dense, states), args.repeats),
+        },
+    }
+
+    print(f"{args.rows:,} rows -> {len(frame):,} cube rows, dense shape {tuple(dense.counts.shape)}")
+    memory = results["memory_bytes"]
+    print(f"memory   pandas long {memory['pandas_long'] / 1024:9.1f} KiB"
+          f"   + per-state index {memory['pandas_state_index'] / 1024:9.1f} KiB"
+          f"   dense {memory['dense'] / 1024:9.1f} KiB")
+    print(f"build    dense {build_ms:9.2f} ms")
+    for name in ("national_ms", "all_drilldowns_ms"):
+        pandas_ms, dense_ms = results[name]["pandas"], results[name]["dense"]
+        print(f"{name[:-3]:<15} pandas {pandas_ms:9.2f} ms   dense {dense_ms:9.2f} ms   x{pandas_ms / dense_ms:6.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Tuple path vs Arrow path for turning query results into DataFrames.
+
+The tuple path is what app1.py used to do: `cur.fetchall()` into Python
+tuples, then `pd.DataFrame(rows, columns=...)`. The Arrow path is
+`dashboard.fetch.arrow_table_to_frame` applied to the Arrow tables a
+Snowflake cursor yields from `fetch_arrow_batches()`. Both are fed the same
+synthetic STATE / CATEGORY / NEGOTIATED_TYPE / ENTRY_COUNT result.
+
+Each (path, rows) case runs in its own interpreter so peak RSS is not
+polluted by earlier cases:
+
+    python -m benchmarks.bench_fetch
+    python -m benchmarks.bench_fetch --rows 10000 1000000 --json fetch.json
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+COLUMNS = ["STATE", "CATEGORY", "NEGOTIATED_TYPE", "ENTRY_COUNT"]
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+BATCH_ROWS = 65_536
+
+
+# Columns shaped like the cube result, drawn with dashboard.synthetic's skew
+def synthetic_columns(n, seed=0):
+    import numpy as np
+
+    from dashboard.synthetic import distributions
+
+    rng = np.random.default_rng(seed)
+    columns = []
+    for values, cum in distributions():
+        probs = np.diff([0.0] + cum)
+        columns.append(np.array(values, dtype=object)[rng.choice(len(values), size=n, p=probs / probs.sum())])
+    columns.append(rng.integers(1, 10_000, n))
+    return columns
+
+
+def tuple_input(columns):
+    return list(zip(*(c.tolist() for c in columns)))
+
+
+def arrow_input(columns):
+    import pyarrow as pa
+
+    n = len(columns[0])
+    return [
+        pa.Table.from_arrays([pa.array(c[start:start + BATCH_ROWS]) for c in columns], names=COLUMNS)
+        for start in range(0, n, BATCH_ROWS)
+    ]
+
+
+def max_rss_bytes():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def run_case(path, rows):
+    import pandas as pd
+
+    columns = synthetic_columns(rows)
+    if path == "tuple":
+        data = tuple_input(columns)
+
+        def convert():
+            return pd.DataFrame(data, columns=COLUMNS)
+    else:
+        import pyarrow as pa
+
+        from dashboard.fetch import arrow_table_to_frame
+
+        data = arrow_input(columns)
+
+        def convert():
+            return arrow_table_to_frame(pa.concat_tables(data), COLUMNS)
+    del columns
+
+    baseline = max_rss_bytes()
+    start = time.perf_counter()
+    frame = convert()
+    elapsed = time.perf_counter() - start
+    return {
+        "path": path,
+        "rows": rows,
+        "seconds": elapsed,
+        "peak_rss_delta_bytes": max(0, max_rss_bytes() - baseline),
+        "frame_bytes": int(frame.memory_usage(deep=True).sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--case", nargs=2, metavar=("PATH", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    results = []
+    print(f"{'rows':>10}  {'path':<6} {'seconds':>9} {'peak RSS +MB':>13} {'frame MB':>9}")
+    for rows in args.rows:
+        for path in ("tuple", "arrow"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_fetch", "--case", path, str(rows)],
+                check=True, capture_output=True, text=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{rows:>10}  {path:<6} {result['seconds']:>9.3f} "
+                  f"{result['peak_rss_delta_bytes'] / 2**20:>13.1f} {result['frame_bytes'] / 2**20:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Latency of a drill-down selectbox change, before and after fragments.
+
+"full" is a whole-script rerun of app1.py, which is what every selectbox
+change cost before the drill-downs became st.fragment functions. AppTest
+always re-executes the whole script, so it measures that path directly.
+
+"fragment" is what a selectbox change costs now: only the drill-down
+fragment runs. It is measured by running a script that consists of nothing
+but the fragment call.
+
+Both run against the local stand-in backend with warm caches, cycling the
+selectbox through every state. By default the whole run is repeated in a
+fresh process with the app's background warmup off and then on (the
+production default); --warmup picks one:
+
+    python -m benchmarks.bench_rerun
+    python -m benchmarks.bench_rerun --rows 5000000 --json rerun.json
+    python -m benchmarks.bench_rerun --warmup on
+"""
+import argparse
+import json
+import os
+import statistics
+
+from benchmarks import REPO_ROOT, WARMUP_MODES, add_warmup_argument, percentile, run_each_warmup_mode, timed
+
+
+def _category_fragment_script():
+    from dashboard.drilldowns import category_drilldown
+
+    category_drilldown()
+
+
+def _negotiated_type_fragment_script():
+    from dashboard.drilldowns import negotiated_type_drilldown
+
+    negotiated_type_drilldown()
+
+
+FRAGMENT_SCRIPTS = {
+    "Category Analytics": _category_fragment_script,
+    "Negotiated Type Breakdown": _negotiated_type_fragment_script,
+}
+
+
+def time_selectbox_changes(at, limit):
+    at.run()
+    options = list(at.selectbox[0].options)[:limit]
+    samples = []
+    for option in options:
+        samples.append(timed(at.selectbox[0].select(option).run))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="synthetic rows in the local database")
+    parser.add_argument("--states", type=int, default=50, help="selectbox values to cycle through")
+    parser.add_argument("--json", help="also write the results to this file")
+    add_warmup_argument(parser)
+    args = parser.parse_args()
+
+    if args.warmup == "both":
+        runs = run_each_warmup_mode("benchmarks.bench_rerun", ["--rows", str(args.rows), "--states", str(args.states)])
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump([result for results in runs.values() for result in results], f, indent=2)
+        return
+
+    os.environ.setdefault("DASHBOARD_BACKEND", "local")
+    os.environ["DASHBOARD_WARMUP"] = WARMUP_MODES[args.warmup]
+    os.environ.setdefault("DASHBOARD_LOCAL_ROWS", str(args.rows))
+
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for section, fragment_script in FRAGMENT_SCRIPTS.items():
+        full = AppTest.from_file(os.path.join(REPO_ROOT, "app1.py"), default_timeout=120)
+        full.run()
+        full.sidebar.radio[0].set_value(section)
+        full_ms = time_selectbox_changes(full, args.states)
+
+        fragment = AppTest.from_function(fragment_script, default_timeout=120)
+        fragment_ms = time_selectbox_changes(fragment, args.states)
+
+        for path, samples in (("full", full_ms), ("fragment", fragment_ms)):
+            result = {
+                "section": section,
+                "warmup": args.warmup,
+                "path": path,
+                "reruns": len(samples),
+                "p50_ms": statistics.median(samples),
+                "p95_ms": percentile(samples, 95),
+            }
+            results.append(result)
+            print(f"{section:<28} {path:<9} p50 {result['p50_ms']:8.1f} ms   p95 {result['p95_ms']:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Several replicas sharing one result store vs each querying on its own.
+
+Simulates --replicas app replicas, each with its own dashboard.shared_cache
+SharedCache but one common store (in-process by default, or any
+DASHBOARD_SHARED_CACHE_URL-style URL such as fakeredis:// or
+redis://localhost:6379/0). Requests for the aggregate cube and the
+negotiated-type pivot are spread over the replicas at random; a miss runs the
+query against an in-memory SQLite copy of the synthetic table and counts as
+a warehouse query. Reports warehouse queries with and without the shared
+tier, fleet and cross-replica hit rates, payload size against the frame's
+in-memory size, and (de)serialisation time.
+
+    python -m benchmarks.bench_shared_cache
+    python -m benchmarks.bench_shared_cache --replicas 8 --url fakeredis://
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+
+from dashboard.cube import CUBE
+from dashboard.fetch import rows_to_frame
+from dashboard.pivot import load_types_by_state
+from dashboard.result_cache import make_key
+from dashboard.rollups import refresh_summaries
+from dashboard.shared_cache import SharedCache, deserialize_frame, serialize_frame, store_from_url
+from dashboard.synthetic import seed_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200_000, help="synthetic rows in the stand-in table")
+    parser.add_argument("--url", default="memory://", help="shared store URL")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(":memory:")
+    seed_rows(conn, args.rows, args.seed)
+    refresh_summaries(conn, None, full=True)
+    warehouse_queries = [0]
+
+    def fetch(statement, params=None):
+        warehouse_queries[0] += 1
+        return rows_to_frame(conn.execute(statement.sql, params or []).fetchall(), statement.columns)
+
+    types = sorted(t for (t,) in conn.execute(
+        "SELECT DISTINCT NEGOTIATED_TYPE FROM ALL_STATE_COMBINED WHERE NEGOTIATED_TYPE IS NOT NULL"
+    ))
+    queries = {
+        make_key(CUBE.sql, "cube"): lambda: fetch(CUBE),
+        make_key("types_by_state", tuple(types)): lambda: load_types_by_state(fetch, types),
+    }
+
+    store = store_from_url(args.url)
+    # A fresh namespace per run, so a real Redis doesn't serve the last run's results
+    prefix = f"bench:{time.time_ns()}:"
+    replicas = [SharedCache(store, replica=f"replica-{i}", prefix=prefix) for i in range(args.replicas)]
+    rng = random.Random(args.seed)
+    keys = list(queries)
+    for _ in range(args.requests):
+        replica = rng.choice(replicas)
+        key = rng.choice(keys)
+        replica.get_or_compute(key, queries[key])
+
+    # Without the shared tier every replica pays each query once
+    shared_queries = warehouse_queries[0]
+    print(f"{args.replicas} replicas, {args.requests} requests over {len(keys)} results ({args.url})")
+    print(f"warehouse queries   shared {shared_queries:5d}   per-replica {len(keys) * args.replicas:5d}")
+    fleet = replicas[0].fleet_stats()
+    print(f"fleet hit rate      {fleet['hit_rate']:6.1%}   cross-replica {fleet['cross_replica_hit_rate']:6.1%}")
+
+    frame = queries[keys[0]]()
+    raw_bytes = int(frame.memory_usage(deep=True).sum())
+    serialize_ms, deserialize_ms = [], []
+    for _ in range(20):
+        start = time.perf_counter()
+        payload = serialize_frame(frame, "bench")
+        serialize_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        deserialize_frame(payload)
+        deserialize_ms.append((time.perf_counter() - start) * 1000)
+    print(f"cube payload        {len(payload) / 1024:8.1f} KiB   in memory {raw_bytes / 1024:8.1f} KiB")
+    print(f"serialize           {statistics.median(serialize_ms):8.2f} ms   "
+          f"deserialize {statistics.median(deserialize_ms):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
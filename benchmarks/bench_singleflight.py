@@ -0,0 +1,78 @@
+"""Stress test: N sessions opening Heatmap Overview at the same instant.
+
+Starts --sessions threads (one per Streamlit session) behind a barrier so
+they all issue the same GROUP BY STATE statement at once against the local
+stand-in backend, first through dashboard.executor.execute_statement (no
+coalescing) and then through run_statement (single-flight). For each it
+reports how many times the statement actually ran and the wall time until
+every session had its result. With coalescing, N sessions should produce
+exactly one query; the script exits 1 if they don't.
+
+    python -m benchmarks.bench_singleflight
+    python -m benchmarks.bench_singleflight --sessions 100 --engine duckdb
+"""
+import argparse
+import json
+import time
+
+from benchmarks import burst
+from dashboard.backends import local_backend
+from dashboard.executor import execute_statement, in_flight, run_statement
+from dashboard.pool import ConnectionPool
+from dashboard.statements import statements
+
+BY_STATE = statements.register("bench_heatmap_by_state", """
+    SELECT STATE, COUNT(*) AS ENTRY_COUNT
+    FROM ALL_STATE_COMBINED
+    WHERE STATE IS NOT NULL
+    GROUP BY STATE
+""", ["STATE", "ENTRY_COUNT"])
+
+
+# burst() of `call`; returns (statement executions, wall ms, per-session results)
+def measure(call, sessions):
+    before = BY_STATE.executions
+    start = time.perf_counter()
+    results, errors = burst(call, sessions)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if errors:
+        raise errors[0]
+    return BY_STATE.executions - before, elapsed_ms, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic rows if the database is empty")
+    parser.add_argument("--engine", choices=["duckdb", "sqlite"])
+    parser.add_argument("--path")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    backend = local_backend(engine=args.engine, path=args.path)
+    backend.seed_rows = args.rows
+    pool = ConnectionPool(backend.connect, size=args.pool_size)
+    # Seed, open a connection and warm the engine's page cache
+    execute_statement(pool, BY_STATE)
+
+    results = {}
+    for name, call in (
+        ("uncoalesced", lambda: execute_statement(pool, BY_STATE)),
+        ("single-flight", lambda: run_statement(pool, BY_STATE)),
+    ):
+        executions, elapsed_ms, frames = measure(call, args.sessions)
+        results[name] = {"executions": executions, "wall_ms": elapsed_ms}
+        identical = all(f.equals(frames[0]) for f in frames)
+        print(f"{name:<14} {args.sessions} sessions -> {executions:3d} queries   {elapsed_ms:8.1f} ms"
+              f"   results identical: {identical}")
+    print(f"single-flight stats: {in_flight.stats()}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": backend.name, "sessions": args.sessions, "results": results}, f, indent=2)
+    raise SystemExit(0 if results["single-flight"]["executions"] == 1 else 1)
+
+
+if __name__ == "__main__":
+    main()
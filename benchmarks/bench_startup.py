@@ -0,0 +1,137 @@
+"""Cold-start cost of each page.
+
+For every page two things are measured, each in a fresh interpreter:
+
+* imports: `python -X importtime` importing streamlit and then the page
+  module. Reports how long the page's own imports take on top of streamlit
+  and which packages dominate them.
+* first paint: AppTest runs app1.py (which paints Home), then navigates to
+  the page. `home_ms` runs from importing AppTest to Home being painted;
+  `page_ms` is the first visit to the page, including its lazy imports and
+  loading the cube from the local backend. First paint is measured with the
+  app's background warmup off and on (--warmup picks one); with it on, the
+  warmup thread competes with the first visit exactly as it does in
+  production.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --json startup.json
+    python -m benchmarks.bench_startup --warmup off
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks import REPO_ROOT, WARMUP_MODES, add_warmup_argument
+
+PAGES = {
+    "Home": "dashboard.pages.home",
+    "Heatmap Overview": "dashboard.pages.heatmap",
+    "Category Analytics": "dashboard.pages.category",
+    "Negotiated Type Breakdown": "dashboard.pages.negotiated_type",
+}
+
+
+# Parse `-X importtime` output into (depth, cumulative_us, module) tuples
+def parse_importtime(stderr):
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, int(cumulative), name.strip()))
+    return entries
+
+
+def measure_imports(module):
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import streamlit; import {module}"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    )
+    entries = parse_importtime(out.stderr)
+    # Top-level entries after streamlit's own are what the page adds
+    streamlit_at = max(i for i, (depth, _, name) in enumerate(entries) if depth == 0 and name == "streamlit")
+    page = entries[streamlit_at + 1:]
+    page_us = sum(cumulative for depth, cumulative, _ in page if depth == 0)
+    # Each package's cost is its largest cumulative entry at any depth (third
+    # party packages are usually pulled in a few levels down); the page's own
+    # package is left out since it is the page total
+    by_package = {}
+    own = module.split(".")[0]
+    for _, cumulative, name in page:
+        root = name.split(".")[0]
+        if root != own:
+            by_package[root] = max(by_package.get(root, 0), cumulative)
+    heaviest = sorted(by_package.items(), key=lambda item: -item[1])[:5]
+    return {
+        "streamlit_import_ms": entries[streamlit_at][1] / 1000,
+        "page_import_ms": page_us / 1000,
+        "heaviest_imports": {name: cumulative / 1000 for name, cumulative in heaviest},
+    }
+
+
+def first_paint(section):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app1.py"), default_timeout=300)
+    at.run()
+    home_ms = (time.perf_counter() - start) * 1000
+    page_ms = 0.0
+    if section != "Home":
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value(section).run()
+        page_ms = (time.perf_counter() - start) * 1000
+    return {"home_ms": home_ms, "page_ms": page_ms}
+
+
+def measure_first_paint(section, warmup):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--first-paint", section],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+        env=dict(os.environ, DASHBOARD_WARMUP=WARMUP_MODES[warmup]),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="synthetic rows in the local database")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--first-paint", metavar="SECTION", help=argparse.SUPPRESS)
+    add_warmup_argument(parser)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DASHBOARD_BACKEND", "local")
+    os.environ.setdefault("DASHBOARD_LOCAL_ROWS", str(args.rows))
+
+    if args.first_paint:
+        print(json.dumps(first_paint(args.first_paint)))
+        return
+
+    # Seed the local database up front so no page's timing includes it
+    from dashboard.backends import get_backend
+
+    get_backend().connect().close()
+
+    modes = list(WARMUP_MODES) if args.warmup == "both" else [args.warmup]
+    results = []
+    for section, module in PAGES.items():
+        imports = measure_imports(module)
+        heaviest = ", ".join(f"{name} {ms:.0f}ms" for name, ms in imports["heaviest_imports"].items())
+        for warmup in modes:
+            result = {"section": section, "warmup": warmup, **imports, **measure_first_paint(section, warmup)}
+            results.append(result)
+            print(f"{section:<28} warmup {warmup:<3}  imports {result['page_import_ms']:7.1f} ms"
+                  f"   home {result['home_ms']:7.1f} ms   first visit {result['page_ms']:7.1f} ms   [{heaviest}]")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
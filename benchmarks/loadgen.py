@@ -0,0 +1,323 @@
+"""Concurrent-session load generator for app1.py.
+
+Starts `streamlit run app1.py` against the local SQLite stand-in and opens N
+simulated browser sessions over Streamlit's own websocket protocol
+(/_stcore/stream, protobuf BackMsg / ForwardMsg). Each session keeps picking
+a random action: switch to a random sidebar section, or, on a page with a
+selectbox, pick a random state; selectbox changes are sent as fragment
+reruns, exactly like the browser does. Latency is measured from sending the
+rerun request to the server's script_finished message.
+
+For each N the server is started fresh and the tool reports throughput,
+latency percentiles, the peak number of open database connections (open
+file descriptors on the SQLite file, Linux only) and peak server RSS.
+
+    python -m benchmarks.loadgen --sessions 1 5 10 25 50 --duration 30
+    python -m benchmarks.loadgen --sessions 10 --json load.json
+
+Widget values are sent the way the running Streamlit expects them: as the
+option's text on releases whose radio / selectbox protos carry raw_value,
+as its index (WidgetState.int_value) on older ones.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks import REPO_ROOT, percentile
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# --- server process ---
+
+class Server:
+    def __init__(self, db_path, pool_size):
+        self.db_path = os.path.abspath(db_path)
+        self.port = free_port()
+        env = dict(
+            os.environ,
+            DASHBOARD_BACKEND="sqlite",
+            DASHBOARD_LOCAL_DB=self.db_path,
+            DASHBOARD_POOL_SIZE=str(pool_size),
+        )
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.join(REPO_ROOT, "app1.py"),
+             "--server.headless", "true", "--server.port", str(self.port),
+             "--browser.gatherUsageStats", "false"],
+            cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def wait_ready(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("streamlit server did not become healthy")
+
+    def rss_bytes(self):
+        try:
+            with open(f"/proc/{self.process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return None
+
+    # Open SQLite connections == file descriptors pointing at the database
+    def open_db_connections(self):
+        fd_dir = f"/proc/{self.process.pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            return None
+        count = 0
+        for fd in fds:
+            try:
+                if os.readlink(os.path.join(fd_dir, fd)) == self.db_path:
+                    count += 1
+            except OSError:
+                continue
+        return count
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+# --- one simulated browser session ---
+
+class _Socket:
+    """Binary websocket client: `websockets`, which newer Streamlit releases
+    ship with, or tornado, which older ones do."""
+
+    def __init__(self, send, recv, close):
+        self.send, self.recv, self.close = send, recv, close
+
+    @classmethod
+    async def connect(cls, url):
+        try:
+            from websockets.asyncio.client import connect
+        except ImportError:
+            connect = None
+        if connect is not None:
+            ws = await connect(url, subprotocols=["streamlit"], max_size=None)
+            return cls(ws.send, ws.recv, ws.close)
+
+        from tornado.websocket import websocket_connect
+
+        ws = await websocket_connect(url, subprotocols=["streamlit"], max_message_size=2**31)
+
+        async def recv():
+            message = await ws.read_message()
+            if message is None:
+                raise ConnectionError("server closed the session")
+            return message
+
+        async def close():
+            ws.close()
+
+        return cls(lambda data: ws.write_message(data, binary=True), recv, close)
+
+
+class Session:
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self.page_script_hash = ""
+        # (id, options, fragment_id) of the page's widgets; value index per id
+        self.radio = None
+        self.selectbox = None
+        self.values = {}
+        self.options = {}
+        self.string_valued = set()
+
+    async def connect(self):
+        self.ws = await _Socket.connect(self.url)
+
+    def _widget(self, msg):
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        if kind not in ("radio", "selectbox"):
+            return
+        proto = getattr(element, kind)
+        widget = (proto.id, list(proto.options), getattr(msg.delta, "fragment_id", ""))
+        if kind == "radio":
+            self.radio = widget
+        else:
+            self.selectbox = widget
+        self.values.setdefault(proto.id, proto.default if proto.HasField("default") else 0)
+        self.options[proto.id] = widget[1]
+        # Newer releases send the chosen option's text, older ones its index
+        if "raw_value" in proto.DESCRIPTOR.fields_by_name:
+            self.string_valued.add(proto.id)
+
+    async def rerun(self, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        back.rerun_script.page_script_hash = self.page_script_hash
+        for widget_id, index in self.values.items():
+            state = back.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            if widget_id in self.string_valued:
+                state.string_value = self.options[widget_id][index]
+            else:
+                state.int_value = index
+        if fragment_id:
+            back.rerun_script.fragment_id = fragment_id
+        elif self.selectbox is not None:
+            # A full rerun may land on a page without the selectbox
+            self.selectbox = None
+
+        start = time.perf_counter()
+        await self.ws.send(back.SerializeToString())
+        while True:
+            raw = await self.ws.recv()
+            if isinstance(raw, str):
+                continue
+            msg = ForwardMsg.FromString(raw)
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.page_script_hash = msg.new_session.page_script_hash
+            elif kind == "delta":
+                self._widget(msg)
+            elif kind == "script_finished":
+                return (time.perf_counter() - start) * 1000
+
+    # One random user action; returns (action, latency_ms)
+    async def act(self):
+        if self.selectbox is not None and self.rng.random() < 0.6:
+            widget_id, options, fragment_id = self.selectbox
+            self.values[widget_id] = self.rng.randrange(len(options))
+            return "selectbox", await self.rerun(fragment_id)
+        widget_id, options, _ = self.radio
+        self.values[widget_id] = self.rng.randrange(len(options))
+        # Drop the old page's selectbox value; its widget goes away
+        if self.selectbox is not None:
+            self.values.pop(self.selectbox[0], None)
+        return "navigate", await self.rerun()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+
+async def run_session(url, seed, stop_at, think_time, samples, errors):
+    session = Session(url, random.Random(seed))
+    try:
+        await session.connect()
+        await session.rerun()
+        while time.monotonic() < stop_at:
+            action, latency_ms = await session.act()
+            samples.append((action, latency_ms))
+            await asyncio.sleep(session.rng.uniform(0, think_time))
+    except Exception as exc:
+        errors.append(repr(exc))
+    finally:
+        await session.close()
+
+
+async def sample_server(server, stop_at, peaks):
+    while time.monotonic() < stop_at:
+        rss = server.rss_bytes()
+        conns = server.open_db_connections()
+        if rss is not None:
+            peaks["rss"] = max(peaks.get("rss") or 0, rss)
+        if conns is not None:
+            peaks["db_connections"] = max(peaks.get("db_connections") or 0, conns)
+        await asyncio.sleep(0.5)
+
+
+async def run_level(server, sessions, duration, think_time):
+    samples, errors, peaks = [], [], {"rss": None, "db_connections": None}
+    # One session first so the cube and figures are warm before timing starts
+    await run_session(server.url, -1, time.monotonic() + 1, 0, [], errors)
+    stop_at = time.monotonic() + duration
+    start = time.monotonic()
+    await asyncio.gather(
+        sample_server(server, stop_at, peaks),
+        *(run_session(server.url, i, stop_at, think_time, samples, errors) for i in range(sessions)),
+    )
+    elapsed = time.monotonic() - start
+    latencies = [ms for _, ms in samples] or [0.0]
+    return {
+        "sessions": sessions,
+        "actions": len(samples),
+        "by_action": {kind: sum(1 for k, _ in samples if k == kind) for kind in ("navigate", "selectbox")},
+        "throughput_per_s": len(samples) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "peak_db_connections": peaks["db_connections"],
+        "peak_server_rss_bytes": peaks["rss"],
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25])
+    parser.add_argument("--duration", type=float, default=20, help="seconds per level")
+    parser.add_argument("--think-time", type=float, default=0.5, help="max pause between actions (s)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic rows in the local database")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    from dashboard.backends import SQLiteBackend
+
+    db_path = os.path.join(tempfile.gettempdir(), f"loadgen_{args.rows}.sqlite")
+    SQLiteBackend(db_path, seed_rows=args.rows).connect().close()
+
+    results = []
+    print(f"{'sessions':>8} {'actions':>8} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+          f" {'db conns':>8} {'RSS MB':>7} errors")
+    for sessions in args.sessions:
+        server = Server(db_path, args.pool_size)
+        try:
+            server.wait_ready()
+            result = asyncio.run(run_level(server, sessions, args.duration, args.think_time))
+        finally:
+            server.stop()
+        results.append(result)
+        rss = result["peak_server_rss_bytes"]
+        print(f"{sessions:>8} {result['actions']:>8} {result['throughput_per_s']:>7.1f}"
+              f" {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+              f" {result['peak_db_connections'] if result['peak_db_connections'] is not None else '-':>8}"
+              f" {rss / 2**20 if rss else float('nan'):>7.1f} {len(result['errors'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
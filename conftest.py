@@ -0,0 +1,18 @@
+# Lives at the repo root so pytest puts the root on sys.path and plain
+# `pytest` can import dashboard and benchmarks, not just `python -m pytest`.
+import pytest
+
+
+class FakeClock:
+    """A monotonic clock the test moves by setting `now`."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
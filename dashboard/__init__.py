@@ -0,0 +1,4 @@
+# Data-access helpers shared by the Streamlit pages in app1.py.
+#
+# Modules in this package are imported once per server process, so any
+# module-level state they hold is shared by every browser session.
@@ -0,0 +1,161 @@
+"""Pluggable backends behind the connection pool (dashboard.data.get_pool).
+
+A backend only has to provide `connect()`, returning a DB-API connection
+whose cursors understand qmark (`?`) parameters. The pool calls it whenever
+it needs a new session, so nothing above the pool knows which engine is in
+use. DASHBOARD_BACKEND picks one: "snowflake" (default), "duckdb", "sqlite",
+or "local" for DuckDB when it is installed and SQLite otherwise.
+"""
+import abc
+import os
+import sqlite3
+import threading
+
+# Schema holding ALL_STATE_COMBINED on Snowflake
+SNOWFLAKE_SCHEMA = "ALL_STATES"
+
+# Path of the local stand-in database; by default each engine gets its own file
+LOCAL_DB_PATH = os.environ.get("DASHBOARD_LOCAL_DB")
+
+# Rows generated the first time a local backend finds ALL_STATE_COMBINED empty
+LOCAL_SEED_ROWS = int(os.environ.get("DASHBOARD_LOCAL_ROWS", 1_000_000))
+
+
+class SnowflakeBackend:
+    name = "snowflake"
+
+    def __init__(self, secrets, credentials):
+        self._secrets = secrets
+        self._credentials = credentials
+
+    def connect(self):
+        import snowflake.connector
+
+        from dashboard.statements import PARAMSTYLE
+
+        return snowflake.connector.connect(
+            user=self._secrets["user"],
+            # Parsed once per process; re-parsed only if the key in secrets changes
+            private_key=self._credentials.private_key_der(self._secrets["private_key"]),
+            account=self._secrets["account"],
+            warehouse=self._secrets["warehouse"],
+            database=self._secrets["database"],
+            schema=SNOWFLAKE_SCHEMA,
+            # Bind parameters server-side so the SQL text is the same for every value
+            paramstyle=PARAMSTYLE
+        )
+
+
+class _LocalBackend(abc.ABC):
+    """Shared behaviour of the embedded stand-ins: one database file, seeded
+    with synthetic rows (and summary tables) the first time a connection
+    finds it empty."""
+
+    name = None
+    default_path = None
+
+    def __init__(self, path=None, seed_rows=LOCAL_SEED_ROWS):
+        self.path = path or LOCAL_DB_PATH or self.default_path
+        self.seed_rows = seed_rows
+        self._seeded = False
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _open(self):
+        """Open a new connection to the database file."""
+
+    @abc.abstractmethod
+    def _seed(self, conn, rows, seed):
+        """Write `rows` synthetic rows into ALL_STATE_COMBINED."""
+
+    def _row_count(self, conn):
+        try:
+            return conn.execute("SELECT COUNT(*) FROM ALL_STATE_COMBINED").fetchone()[0]
+        except Exception:
+            return 0
+
+    # Synthetic raw rows plus freshly built summary tables
+    def _populate(self, conn, rows, seed):
+        from dashboard.rollups import refresh_summaries
+
+        self._seed(conn, rows, seed)
+        refresh_summaries(conn, watermark_column=None, full=True)
+
+    def seed(self, rows, seed=0):
+        conn = self._open()
+        try:
+            self._populate(conn, rows, seed)
+        finally:
+            conn.close()
+        self._seeded = True
+
+    def connect(self):
+        with self._lock:
+            if not self._seeded:
+                conn = self._open()
+                try:
+                    if self._row_count(conn) == 0 and self.seed_rows:
+                        self._populate(conn, self.seed_rows, 0)
+                finally:
+                    conn.close()
+                self._seeded = True
+        return self._open()
+
+
+class SQLiteBackend(_LocalBackend):
+    name = "sqlite"
+    default_path = "local_all_states.sqlite"
+
+    # Connections are handed between Streamlit's session threads by the pool,
+    # so the same-thread check is turned off.
+    def _open(self):
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def _seed(self, conn, rows, seed):
+        from dashboard.synthetic import seed_rows
+
+        seed_rows(conn, rows, seed=seed)
+
+
+class DuckDBBackend(_LocalBackend):
+    name = "duckdb"
+    default_path = "local_all_states.duckdb"
+
+    def _open(self):
+        import duckdb
+
+        return duckdb.connect(self.path)
+
+    def _seed(self, conn, rows, seed):
+        from dashboard.synthetic import seed_duckdb
+
+        seed_duckdb(conn, rows, seed=seed)
+
+
+def duckdb_available():
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def local_backend(engine=None, path=None):
+    if engine is None:
+        engine = "duckdb" if duckdb_available() else "sqlite"
+    if engine == "duckdb":
+        return DuckDBBackend(path=path)
+    if engine == "sqlite":
+        return SQLiteBackend(path=path)
+    raise ValueError(f"unknown local engine {engine!r}")
+
+
+# The backend selected by DASHBOARD_BACKEND. `secrets` and `credentials`
+# are only used by Snowflake.
+def get_backend(secrets=None, credentials=None):
+    name = os.environ.get("DASHBOARD_BACKEND", "snowflake").lower()
+    if name == "snowflake":
+        return SnowflakeBackend(secrets, credentials)
+    if name == "local":
+        return local_backend()
+    return local_backend(engine=name)
@@ -0,0 +1,61 @@
+import threading
+import time
+
+DIMENSIONS = ["STATE", "CATEGORY", "NEGOTIATED_TYPE"]
+
+
+# Sorted, non-null distinct values of each dimension column in a frame
+def dimensions_from_frame(frame, dimensions=DIMENSIONS):
+    return {
+        dim: sorted(frame[dim].dropna().unique().tolist())
+        for dim in dimensions if dim in frame.columns
+    }
+
+
+class DimensionCatalog:
+    """Distinct STATE / CATEGORY / NEGOTIATED_TYPE values for the widgets.
+
+    `load` returns a dict of dimension -> sorted values. It is called on first
+    use and again once the snapshot is older than `refresh_interval` seconds,
+    or, if a `version` callable is given, as soon as it returns something
+    new; in between, every session reads the same in-memory lists.
+    """
+
+    def __init__(self, load, refresh_interval=3600, clock=time.monotonic, version=None):
+        self._load = load
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._version = version
+        self._lock = threading.Lock()
+        self._values = None
+        self._loaded_at = None
+        self._loaded_version = None
+
+    def refresh(self):
+        version = self._version() if self._version is not None else None
+        values = self._load()
+        with self._lock:
+            self._values = values
+            self._loaded_at = self._clock()
+            self._loaded_version = version
+        return values
+
+    def _current(self):
+        with self._lock:
+            values, loaded_at, loaded_version = self._values, self._loaded_at, self._loaded_version
+        if (values is None or self._clock() - loaded_at >= self.refresh_interval
+                or (self._version is not None and self._version() != loaded_version)):
+            values = self.refresh()
+        return values
+
+    def values(self, dimension):
+        return list(self._current().get(dimension, []))
+
+    def states(self):
+        return self.values("STATE")
+
+    def categories(self):
+        return self.values("CATEGORY")
+
+    def negotiated_types(self):
+        return self.values("NEGOTIATED_TYPE")
@@ -0,0 +1,70 @@
+"""Snowflake compile time per statement, read from the query history.
+
+execute_ms in the query log is client-side wall clock: compile, execute and
+the round trip in one number. Snowflake records COMPILATION_TIME for every
+query_id, so collect_compile_times() looks the logged query_ids up in
+INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER(), adds compile_ms to their query
+log records and credits it to each statement (Statement.stats()). It runs
+on the background version probe, never on a request. Local backends log no
+query_id, so there is nothing to look up and it never queries.
+
+QUERY_HISTORY_BY_USER rather than _BY_SESSION because the pool spreads
+queries over several sessions. CURRENT_TIMESTAMP() also keeps Snowflake
+from answering it from the result cache.
+"""
+import logging
+import threading
+import time
+
+from dashboard.instrumentation import query_log
+from dashboard.statements import statements
+
+logger = logging.getLogger(__name__)
+
+# How far back the history lookup reaches; older queries are given up on
+HISTORY_WINDOW_S = 3600
+
+COMPILE_TIMES = statements.register("query_compile_times", f"""
+    SELECT QUERY_ID, COMPILATION_TIME
+    FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER(
+        END_TIME_RANGE_START => DATEADD('second', -{HISTORY_WINDOW_S}, CURRENT_TIMESTAMP()),
+        RESULT_LIMIT => 10000))
+""", ["QUERY_ID", "COMPILATION_TIME"])
+
+_collecting = threading.Lock()
+
+
+# Fill in compile_ms for the logged queries that don't have it yet, using
+# fetch(statement) to read the history; returns how many were found. Queries
+# that aren't in the history yet are retried on the next call, until they
+# fall out of the window.
+def collect_compile_times(fetch, log=query_log, registry=statements, clock=time.time):
+    if not _collecting.acquire(blocking=False):
+        return 0
+    try:
+        # The lookup's own query is logged too; looking that up would keep
+        # one history query running every poll forever
+        pending = [r for r in log.awaiting("compile_ms") if r["statement"] != COMPILE_TIMES.name]
+        if not pending:
+            return 0
+        try:
+            frame = fetch(COMPILE_TIMES)
+        except Exception:
+            logger.warning("could not read compile times from the query history", exc_info=True)
+            return 0
+        # Still-running queries have no COMPILATION_TIME yet
+        frame = frame.dropna(subset=["COMPILATION_TIME"])
+        compile_ms = dict(zip(frame["QUERY_ID"], frame["COMPILATION_TIME"]))
+        found = 0
+        for record in pending:
+            ms = compile_ms.get(record["query_id"])
+            if ms is not None:
+                log.update(record, compile_ms=float(ms))
+                if record["statement"] in registry:
+                    registry[record["statement"]].record_compile(float(ms))
+                found += 1
+            elif clock() - record["at"] > HISTORY_WINDOW_S:
+                log.update(record, compile_ms=None)
+        return found
+    finally:
+        _collecting.release()
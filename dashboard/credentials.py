@@ -0,0 +1,67 @@
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialsProvider:
+    """Converts the PEM private key from secrets into the PKCS8 DER bytes the
+    Snowflake connector expects, once per process.
+
+    The result is cached against a hash of the PEM text, so editing
+    secrets.toml (which Streamlit reloads on the fly) triggers exactly one
+    re-parse and every other call is a dictionary lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._der = None
+        self._stats = {"loads": 0, "hits": 0, "last_load_ms": None, "total_load_ms": 0.0}
+
+    def _load(self, pem, password):
+        # Imported here so pages that never connect skip the cryptography import
+        from cryptography.hazmat.primitives import serialization
+
+        private_key = serialization.load_pem_private_key(pem, password=password)
+        return private_key.private_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+
+    def private_key_der(self, pem, password=None):
+        if isinstance(pem, str):
+            pem = pem.encode()
+        if isinstance(password, str):
+            password = password.encode()
+        fingerprint = hashlib.sha256(pem + b"\0" + (password or b"")).hexdigest()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                self._stats["hits"] += 1
+                return self._der
+            start = time.perf_counter()
+            der = self._load(pem, password)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._fingerprint = fingerprint
+            self._der = der
+            self._stats["loads"] += 1
+            self._stats["last_load_ms"] = elapsed_ms
+            self._stats["total_load_ms"] += elapsed_ms
+        logger.info("private key parsed and converted in %.1f ms", elapsed_ms)
+        return der
+
+    def invalidate(self):
+        with self._lock:
+            self._fingerprint = None
+            self._der = None
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+# Process-wide provider shared by every session
+credentials = CredentialsProvider()
@@ -0,0 +1,108 @@
+import logging
+
+from dashboard.dense_cube import DenseCube
+from dashboard.rollups import SUMMARY_STATE_CATEGORY_TYPE, is_missing_table
+from dashboard.slicing import StateIndex
+from dashboard.statements import statements
+
+logger = logging.getLogger(__name__)
+
+# One query, grouped at the finest grain the dashboard uses. NULL CATEGORY /
+# NEGOTIATED_TYPE groups are kept on purpose: COUNT(*) is additive, so the
+# coarser rollups are plain sums over this result and the per-section
+# "IS NOT NULL" filters become row filters on it. That gives the same answer
+# as GROUPING SETS ((STATE), (STATE, CATEGORY), (STATE, CATEGORY,
+# NEGOTIATED_TYPE)) with a smaller result and SQL every backend understands.
+CUBE_SQL = """
+    SELECT STATE, CATEGORY, NEGOTIATED_TYPE, COUNT(*) AS ENTRY_COUNT
+    FROM ALL_STATE_COMBINED
+    WHERE STATE IS NOT NULL
+    GROUP BY STATE, CATEGORY, NEGOTIATED_TYPE
+"""
+CUBE_COLUMNS = ["STATE", "CATEGORY", "NEGOTIATED_TYPE", "ENTRY_COUNT"]
+CUBE = statements.register("aggregate_cube", CUBE_SQL, CUBE_COLUMNS)
+
+# The same rows read from the summary table kept up to date by
+# dashboard/rollups.py, so page latency doesn't grow with the raw table
+SUMMARY_CUBE = statements.register("aggregate_cube_summary", f"""
+    SELECT STATE, CATEGORY, NEGOTIATED_TYPE, ENTRY_COUNT
+    FROM {SUMMARY_STATE_CATEGORY_TYPE}
+    WHERE STATE IS NOT NULL
+""", CUBE_COLUMNS)
+
+
+# Load the cube's rows with `fetch(statement)`, preferring the summary table
+# and falling back to aggregating the raw table only if it hasn't been built
+def load_cube_frame(fetch):
+    try:
+        return fetch(SUMMARY_CUBE)
+    except Exception as exc:
+        if not is_missing_table(exc):
+            raise
+        logger.warning("%s not built yet, aggregating the raw table instead", SUMMARY_STATE_CATEGORY_TYPE)
+        return fetch(CUBE)
+
+
+class AggregateCube:
+    """Entry counts by STATE x CATEGORY x NEGOTIATED_TYPE, with the rollups
+    each section needs derived locally and memoised on first use."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._rollups = {}
+        self._indexes = {}
+        self._dense = None
+
+    def _rollup(self, name, build):
+        if name not in self._rollups:
+            self._rollups[name] = build()
+        return self._rollups[name].copy()
+
+    # Equivalent to GROUP BY STATE
+    def by_state(self):
+        return self._rollup("state", lambda: (
+            self.frame.groupby("STATE", as_index=False, observed=True)["ENTRY_COUNT"].sum()
+        ))
+
+    # Equivalent to GROUP BY STATE, CATEGORY ... WHERE CATEGORY IS NOT NULL
+    def by_state_category(self):
+        def build():
+            rows = self.frame[self.frame["CATEGORY"].notna()]
+            out = rows.groupby(["STATE", "CATEGORY"], as_index=False, observed=True)["ENTRY_COUNT"].sum()
+            return out.rename(columns={"ENTRY_COUNT": "CATEGORY_COUNT"})
+        return self._rollup("state_category", build)
+
+    # Equivalent to GROUP BY STATE, CATEGORY, NEGOTIATED_TYPE with both NOT NULL
+    def by_state_category_type(self):
+        def build():
+            rows = self.frame[self.frame["CATEGORY"].notna() & self.frame["NEGOTIATED_TYPE"].notna()]
+            return rows.rename(columns={"ENTRY_COUNT": "TYPE_COUNT"}).reset_index(drop=True)
+        return self._rollup("state_category_type", build)
+
+    def _index(self, name, build):
+        if name not in self._indexes:
+            self._indexes[name] = build()
+        return self._indexes[name]
+
+    # Per-state CATEGORY counts, largest first; no query needed
+    def categories_for_state(self, state):
+        return self._index("categories_by_state", lambda: StateIndex(
+            self.by_state_category(), sort_by="CATEGORY_COUNT", ascending=False
+        )).slice(state)
+
+    # The same counts as a dense array (see dashboard/dense_cube.py), for
+    # the wide tables that would otherwise need a pivot
+    def dense(self):
+        if self._dense is None:
+            self._dense = DenseCube.from_frame(self.frame)
+        return self._dense
+
+    # Per-state CATEGORY x NEGOTIATED_TYPE table, one column per type
+    def type_pivot(self, state):
+        return self.dense().type_pivot(state)
+
+    # Lets the result cache account for the cube's size
+    def memory_usage(self, deep=True):
+        frames = [self.frame] + list(self._rollups.values())
+        dense = 0 if self._dense is None else self._dense.memory_usage()
+        return int(sum(f.memory_usage(deep=deep).sum() for f in frames)) + dense
@@ -0,0 +1,150 @@
+"""Data access shared by every page: the connection pool, query execution
+and the cached aggregate cube and dimension catalog.
+
+Everything here is process-wide: this module is imported once per server,
+and the st.cache_resource / result-cache entries it creates are shared by
+every session.
+"""
+import os
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+from dashboard.backends import get_backend
+from dashboard.catalog import DimensionCatalog, dimensions_from_frame
+from dashboard.compile_times import collect_compile_times
+from dashboard.credentials import credentials
+from dashboard.cube import CUBE, AggregateCube, load_cube_frame
+from dashboard.disk_cache import disk_cache
+from dashboard.executor import run_statement
+from dashboard.pivot import load_types_by_state, pivot_statement
+from dashboard.pool import ConnectionPool
+from dashboard.result_cache import make_key, query_cache
+from dashboard.shared_cache import shared_cache
+from dashboard.versioning import TableVersion
+
+
+# Seconds between table version probes, and between idle-connection sweeps
+def _poll_interval():
+    return float(os.environ.get("DASHBOARD_VERSION_POLL", 60))
+
+
+# One connection pool per server process, shared by every session and rerun.
+# DASHBOARD_BACKEND picks what it connects to (see dashboard/backends.py).
+# Idle connections are swept on the version-poll cadence, traffic or not.
+@st.cache_resource
+def get_pool():
+    backend = get_backend(st.secrets, credentials)
+    pool = ConnectionPool(backend.connect, size=int(os.environ.get("DASHBOARD_POOL_SIZE", "4")))
+    pool.evict_periodically(max(_poll_interval(), 1))
+    return pool
+
+
+# Run a registered statement (see dashboard/statements.py) on a pooled
+# connection and return its rows as a DataFrame
+def fetch_frame(statement, params=None):
+    return run_statement(get_pool(), statement, params)
+
+
+# Background work (refreshes, version probes) borrows the calling script's
+# context, like the warmup thread, so the st.cache_resource lookups it
+# makes behave the same
+def _in_background(fn):
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+    thread = threading.Thread(target=fn, name="dashboard-revalidate", daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+
+
+# Background version probes also read back the compile times Snowflake
+# recorded for the queries since the last one (see dashboard/compile_times.py)
+def _probe_in_background(probe):
+    def run():
+        probe()
+        collect_compile_times(fetch_frame)
+
+    _in_background(run)
+
+
+# Version of ALL_STATE_COMBINED and its summary (see dashboard/versioning.py),
+# probed at most every DASHBOARD_VERSION_POLL seconds on a background thread
+@st.cache_resource
+def get_table_version():
+    return TableVersion(
+        fetch_frame, interval=_poll_interval(), spawn=_probe_in_background,
+    )
+
+
+def data_version():
+    return get_table_version().current()
+
+
+# Cache entries record the table version they were computed from and are
+# refreshed when it changes, so they never need to expire while it is known;
+# the TTL only applies when the version can't be read
+def _ttl(version):
+    return None if version is None else float("inf")
+
+
+# compute(), or a copy of its result at this table version saved on disk
+# (see dashboard/disk_cache.py) or by another replica (dashboard/shared_cache.py),
+# checked in that order, so neither a restart nor a new replica re-queries
+def _persisted(sql, params, version, compute):
+    if shared_cache is not None:
+        key = make_key(sql, (params, version))
+        compute = lambda compute=compute: shared_cache.get_or_compute(key, compute)
+    if disk_cache is None:
+        return compute()
+    return disk_cache.get_or_compute(sql, params, version, compute)
+
+
+# The three map sections all slice this one cached aggregate instead of
+# running their own GROUP BY; it is read from the summary table when one exists.
+# Returns (cube, computed_at, table_version it was computed at). The cube is
+# served stale-while-revalidate: once the table version changes (or, if the
+# version is unknown, after the TTL) the old cube is returned at once and
+# rebuilt in the background; only the very first load waits.
+def load_cube_snapshot():
+    current = data_version()
+    return query_cache.get_or_revalidate(
+        CUBE.sql, "cube",
+        lambda: AggregateCube(_persisted(CUBE.sql, "cube", current, lambda: load_cube_frame(fetch_frame))),
+        ttl=_ttl(current), spawn=_in_background, version=current,
+    )
+
+
+def load_cube():
+    return load_cube_snapshot()[0]
+
+
+# One row per state, one column per negotiated type, pivoted in SQL (see
+# dashboard/pivot.py); the columns follow the catalog's current type list.
+# Cached and returned like load_cube_snapshot().
+def load_type_pivot_snapshot():
+    current = data_version()
+    types = get_catalog().negotiated_types()
+    sql = pivot_statement(len(types)).sql
+    return query_cache.get_or_revalidate(
+        sql, tuple(types),
+        lambda: _persisted(sql, tuple(types), current, lambda: load_types_by_state(fetch_frame, types)),
+        ttl=_ttl(current), spawn=_in_background, version=current,
+    )
+
+
+# "Data as of ..." under a map, from the time its data was computed
+def show_data_as_of(as_of):
+    st.caption(f"🕒 Data as of {datetime.fromtimestamp(as_of):%Y-%m-%d %H:%M:%S}")
+
+
+# Distinct STATE / CATEGORY / NEGOTIATED_TYPE values for the selectboxes,
+# read off the cube rather than a SELECT DISTINCT over the raw table, and
+# re-read whenever the cube being served comes from a new table version
+@st.cache_resource
+def get_catalog():
+    return DimensionCatalog(
+        lambda: dimensions_from_frame(load_cube().frame),
+        refresh_interval=float(os.environ.get("DASHBOARD_CATALOG_REFRESH", 3600)),
+        version=lambda: load_cube_snapshot()[2],
+    )
@@ -0,0 +1,100 @@
+"""Entry counts as a dense STATE x CATEGORY x NEGOTIATED_TYPE array.
+
+The cube frame (dashboard/cube.py) is long: one row per group. Here each
+dimension is dictionary-encoded to integer positions and the counts live in
+a single int64 array indexed [state, category, negotiated_type]. A state's
+slice is a view, rollups are sums along axes, and the wide tables the pages
+show are slices of the array instead of pivots.
+
+Every axis ends in one extra slot for NULL, so totals still count rows with
+no CATEGORY / NEGOTIATED_TYPE while the per-category views leave them out.
+"""
+import numpy as np
+import pandas as pd
+
+AXES = ("STATE", "CATEGORY", "NEGOTIATED_TYPE")
+
+
+class DenseCube:
+    def __init__(self, labels, counts):
+        # labels[axis] lists the non-NULL values; position len(labels[axis]) is NULL
+        self.labels = [list(axis) for axis in labels]
+        self.counts = counts
+        self._positions = [{label: i for i, label in enumerate(axis)} for axis in self.labels]
+
+    @classmethod
+    def from_frame(cls, frame, value="ENTRY_COUNT"):
+        labels, codes = [], []
+        for axis in AXES:
+            present = sorted(frame[axis].dropna().unique().tolist())
+            axis_codes = pd.Categorical(frame[axis], categories=present).codes.astype(np.int64)
+            labels.append(present)
+            codes.append(np.where(axis_codes < 0, len(present), axis_codes))
+        shape = tuple(len(axis) + 1 for axis in labels)
+        flat = np.ravel_multi_index(codes, shape) if len(frame) else np.array([], dtype=np.int64)
+        counts = np.bincount(flat, weights=frame[value].to_numpy(dtype=np.float64), minlength=int(np.prod(shape)))
+        return cls(labels, counts.astype(np.int64).reshape(shape))
+
+    def position(self, axis, label):
+        return self._positions[AXES.index(axis)].get(label)
+
+    # [category, negotiated_type] counts for one state, as a view; None if absent
+    def state(self, state):
+        i = self.position("STATE", state)
+        return None if i is None else self.counts[i]
+
+    # Sum out every axis not named in `keep`, e.g. marginal("STATE") is the
+    # per-state total and marginal("STATE", "NEGOTIATED_TYPE") a 2-D table
+    def marginal(self, *keep):
+        return self.counts.sum(axis=tuple(i for i, axis in enumerate(AXES) if axis not in keep))
+
+    # Long frame over the non-NULL cells of a 1-D or 2-D table, zero cells dropped
+    def _long(self, table, axes, value_name):
+        positions = np.nonzero(table)
+        data = {
+            axis: pd.Categorical.from_codes(codes, categories=self.labels[AXES.index(axis)])
+            for axis, codes in zip(axes, positions)
+        }
+        data[value_name] = table[positions]
+        return pd.DataFrame(data)
+
+    # Same rows as AggregateCube.by_state()
+    def by_state(self):
+        return self._long(self.marginal("STATE")[:-1], ["STATE"], "ENTRY_COUNT")
+
+    # Same rows as AggregateCube.by_state_category(), NULL categories excluded
+    def by_state_category(self):
+        table = self.marginal("STATE", "CATEGORY")[:-1, :-1]
+        return self._long(table, ["STATE", "CATEGORY"], "CATEGORY_COUNT")
+
+    # Per-state CATEGORY counts, largest first
+    def categories_for_state(self, state):
+        counts = self.state(state)
+        if counts is None:
+            return pd.DataFrame({"CATEGORY": pd.Categorical([]), "CATEGORY_COUNT": np.array([], dtype=np.int64)})
+        frame = self._long(counts[:-1].sum(axis=1), ["CATEGORY"], "CATEGORY_COUNT")
+        return frame.sort_values("CATEGORY_COUNT", ascending=False, kind="stable").reset_index(drop=True)
+
+    # CATEGORY x NEGOTIATED_TYPE table for one state, NULLs and empty
+    # rows/columns dropped; what the drill-down used to pivot() for
+    def type_pivot(self, state):
+        counts = self.state(state)
+        table = np.zeros((0, 0), dtype=np.int64) if counts is None else counts[:-1, :-1]
+        rows, columns = table.any(axis=1), table.any(axis=0)
+        return pd.DataFrame(
+            table[rows][:, columns],
+            index=pd.Index(np.array(self.labels[1], dtype=object)[rows] if len(rows) else [], name="CATEGORY"),
+            columns=pd.Index(np.array(self.labels[2], dtype=object)[columns] if len(columns) else [], name="NEGOTIATED_TYPE"),
+        )
+
+    # One row per state with a column per NEGOTIATED_TYPE (non-NULL CATEGORY
+    # only), the wide table the Negotiated Type Breakdown map hovers over
+    def types_by_state(self):
+        table = self.counts[:-1, :-1, :-1].sum(axis=1)
+        rows, columns = table.any(axis=1), table.any(axis=0)
+        frame = pd.DataFrame(table[rows][:, columns], columns=np.array(self.labels[2], dtype=object)[columns])
+        frame.insert(0, "STATE", pd.Categorical.from_codes(np.nonzero(rows)[0], categories=self.labels[0]))
+        return frame
+
+    def memory_usage(self):
+        return int(self.counts.nbytes)
@@ -0,0 +1,150 @@
+"""Query results persisted to local Arrow IPC files, so a restart or
+redeploy starts warm instead of re-querying the warehouse.
+
+Each result is one `<key>.arrow` file in DASHBOARD_DISK_CACHE_DIR (default
+.dashboard_cache). The file's schema metadata records the table version it
+was computed from (dashboard/versioning.py) and when it was written, so
+there is no shared index to keep consistent: every entry is written to its
+own temporary file and renamed into place, and several server processes
+can share the directory. An entry is used only while its version matches
+the current one; when the version is unknown it is used until it is older
+than `max_age`. Files are read through a memory map, so loading the cube
+after a restart costs about as much as building the DataFrame.
+
+Arrow IPC rather than Parquet: it can be memory-mapped and read without
+decoding. Everything is skipped when pyarrow isn't installed or
+DASHBOARD_DISK_CACHE=0.
+"""
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from dashboard.result_cache import make_key
+
+logger = logging.getLogger(__name__)
+
+# Schema metadata key holding an entry's {"version", "created_at"}
+ENTRY_METADATA_KEY = b"dashboard.entry"
+
+
+# Checked without importing it, so startup doesn't pay for pyarrow
+def pyarrow_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class DiskCache:
+    def __init__(self, directory, max_age=6 * 3600, clock=time.time):
+        self.directory = directory
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "misses": 0, "writes": 0, "errors": 0, "load_ms": 0.0, "write_ms": 0.0}
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _valid(self, entry, version):
+        if version is not None:
+            return entry["version"] == version
+        return self._clock() - entry["created_at"] < self.max_age
+
+    def get(self, key, version):
+        import pyarrow as pa
+
+        from dashboard.fetch import apply_dtypes
+
+        name = f"{key}.arrow"
+        start = time.perf_counter()
+        try:
+            with pa.memory_map(self._path(name)) as source:
+                reader = pa.ipc.open_file(source)
+                entry = json.loads((reader.schema.metadata or {})[ENTRY_METADATA_KEY])
+                if not self._valid(entry, version):
+                    self._count("misses")
+                    return None
+                frame = apply_dtypes(reader.read_all().to_pandas())
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            logger.warning("could not read cached result %s", name, exc_info=True)
+            self._count("errors")
+            return None
+        with self._lock:
+            self._stats["loads"] += 1
+            self._stats["load_ms"] += (time.perf_counter() - start) * 1000
+        return frame
+
+    # Written to a temporary file of its own and renamed, so readers in any
+    # process see either the previous entry or the whole new one
+    def put(self, key, frame, version):
+        import pyarrow as pa
+
+        start = time.perf_counter()
+        name = f"{key}.arrow"
+        tmp = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[ENTRY_METADATA_KEY] = json.dumps({"version": version, "created_at": self._clock()})
+            table = table.replace_schema_metadata(metadata)
+            fd, tmp = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=self.directory)
+            os.close(fd)
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, self._path(name))
+            tmp = None
+            with self._lock:
+                self._stats["writes"] += 1
+                self._stats["write_ms"] += (time.perf_counter() - start) * 1000
+        except (OSError, pa.ArrowException):
+            logger.warning("could not persist cached result %s", name, exc_info=True)
+            self._count("errors")
+        finally:
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    # The stored frame for (sql, params) at `version`, or compute() it and
+    # store the result. `params` must not include the version itself: a new
+    # version replaces the file of the old one.
+    def get_or_compute(self, sql, params, version, compute):
+        key = make_key(sql, params)
+        frame = self.get(key, version)
+        if frame is None:
+            frame = compute()
+            self.put(key, frame, version)
+        return frame
+
+    def clear(self):
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.endswith((".arrow", ".tmp")):
+                try:
+                    os.remove(self._path(name))
+                except FileNotFoundError:
+                    pass
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, directory=self.directory)
+
+
+# Shared by every session in this server process; None when disabled
+disk_cache = None
+if os.environ.get("DASHBOARD_DISK_CACHE", "1") != "0" and pyarrow_available():
+    disk_cache = DiskCache(
+        os.environ.get("DASHBOARD_DISK_CACHE_DIR", ".dashboard_cache"),
+        max_age=float(os.environ.get("DASHBOARD_CACHE_TTL", 6 * 3600)),
+    )
@@ -0,0 +1,32 @@
+"""Per-state drill-downs for the Category Analytics and Negotiated Type
+Breakdown pages.
+
+Each one is an st.fragment: changing its selectbox reruns only the fragment,
+not the page around it, so the national map and everything above it are left
+alone. Inputs come from the process-wide caches in dashboard.data.
+"""
+import streamlit as st
+
+from dashboard.data import get_catalog, load_cube
+
+
+@st.fragment
+def category_drilldown():
+    selected_state = st.selectbox("👇 Select a state to view detailed CATEGORY breakdown:", get_catalog().states())
+
+    # Answered from the cube already in memory; no warehouse round-trip
+    category_data = load_cube().categories_for_state(selected_state)
+
+    st.markdown(f"📌 **Detailed breakdown for `{selected_state}`**")
+    st.dataframe(category_data, use_container_width=True)
+
+
+@st.fragment
+def negotiated_type_drilldown():
+    selected_state = st.selectbox("Select a state:", get_catalog().states())
+
+    # A slice of the dense cube, already one column per type
+    type_pivot = load_cube().type_pivot(selected_state)
+
+    st.markdown(f"### 🔍 Negotiated Type Breakdown for `{selected_state}`")
+    st.dataframe(type_pivot.reset_index(), use_container_width=True)
@@ -0,0 +1,93 @@
+"""Statement execution, one at a time or several at once.
+
+Independent statements are submitted together to a process-wide thread
+pool and each runs on its own pooled connection, so a batch takes about as
+long as its slowest statement rather than the sum of all of them. The
+Snowflake connector, sqlite3 and DuckDB all release the GIL while a query
+runs, so threads are enough here.
+
+Identical statements (same SQL and parameters) that are requested while one
+is already running don't run again: they wait for the running one and share
+its result (see dashboard/singleflight.py). DASHBOARD_SINGLE_FLIGHT=0 turns
+that off.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dashboard.fetch import cursor_to_frame
+from dashboard.instrumentation import query_log
+from dashboard.singleflight import SingleFlight
+
+MAX_WORKERS = int(os.environ.get("DASHBOARD_QUERY_WORKERS", "4"))
+SINGLE_FLIGHT = os.environ.get("DASHBOARD_SINGLE_FLIGHT", "1") != "0"
+
+# Shared by every session in this server process
+in_flight = SingleFlight()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="dashboard-query")
+        return _executor
+
+
+# Run a registered statement (see dashboard/statements.py) on a connection
+# from `pool` and return its rows as a DataFrame, joining an identical run
+# that is already in flight instead of starting another
+def run_statement(pool, statement, params=None):
+    if not SINGLE_FLIGHT:
+        return execute_statement(pool, statement, params)
+    return in_flight.do((id(pool), statement.sql, repr(params)), lambda: execute_statement(pool, statement, params))
+
+
+# run_statement() without coalescing. Values are always passed as bind
+# parameters, never formatted into the SQL. Each run is recorded in the
+# query log (see dashboard/instrumentation.py).
+def execute_statement(pool, statement, params=None):
+    requested = time.perf_counter()
+    record = {"statement": statement.name, "query_id": None, "error": None}
+
+    def fetch(conn):
+        started = time.perf_counter()
+        record["connect_ms"] = (started - requested) * 1000
+        cur = conn.cursor()
+        try:
+            if params is None:
+                cur.execute(statement.sql)
+            else:
+                cur.execute(statement.sql, params)
+            execute_ms = (time.perf_counter() - started) * 1000
+            statement.record(execute_ms)
+            record["execute_ms"] = execute_ms
+            record["query_id"] = getattr(cur, "sfqid", None)
+            frame = cursor_to_frame(cur, statement.columns, timings=record)
+            record["rows"] = len(frame)
+            return frame
+        finally:
+            cur.close()
+
+    try:
+        return pool.run(fetch)
+    except Exception as exc:
+        record["error"] = repr(exc)
+        raise
+    finally:
+        query_log.record(**record)
+
+
+# Call each zero-argument callable on the executor and return their results
+# in order. Every call is allowed to finish before the first error is raised.
+def gather(calls):
+    futures = [get_executor().submit(call) for call in calls]
+    errors = [f.exception() for f in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [f.result() for f in futures]
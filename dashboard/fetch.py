@@ -0,0 +1,77 @@
+import time
+
+import pandas as pd
+
+# Low-cardinality dimension columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ("STATE", "CATEGORY", "NEGOTIATED_TYPE")
+
+
+# Give a freshly fetched frame the dashboard's dtypes: categoricals for the
+# dimensions, int64 for the *_COUNT measures
+def apply_dtypes(frame):
+    for column in frame.columns:
+        if column in CATEGORICAL_COLUMNS:
+            if not isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = frame[column].astype("category")
+        elif column.endswith("_COUNT"):
+            frame[column] = frame[column].fillna(0).astype("int64")
+    return frame
+
+
+# Convert an Arrow table to a frame. Dimension columns are dictionary-encoded
+# first so pandas gets categoricals directly instead of one str per row.
+def arrow_table_to_frame(table, columns):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    table = table.rename_columns(columns)
+    for i, name in enumerate(columns):
+        if name in CATEGORICAL_COLUMNS and not pa.types.is_dictionary(table.schema.field(i).type):
+            table = table.set_column(i, name, pc.dictionary_encode(table.column(i)))
+    return apply_dtypes(table.to_pandas())
+
+
+# DataFrame from tuples; what every cursor supports
+def rows_to_frame(rows, columns):
+    return apply_dtypes(pd.DataFrame.from_records(rows, columns=columns))
+
+
+# Read the rest of an executed cursor into a typed DataFrame. Snowflake
+# cursors hand over their Arrow results as-is (fetch_arrow_batches() yields
+# one pyarrow.Table per result chunk); other DB-API cursors (the local
+# stand-in) fall back to fetchall().
+#
+# If a `timings` dict is passed it is filled with fetch_ms (pulling the
+# result off the wire), build_ms (turning it into a frame) and result_bytes
+# (Arrow buffer size, or the frame's size on the tuple path).
+def cursor_to_frame(cur, columns, timings=None):
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    batches = None
+    fetch_arrow_batches = getattr(cur, "fetch_arrow_batches", None)
+    if fetch_arrow_batches is not None:
+        try:
+            from snowflake.connector.errors import NotSupportedError
+        except ImportError:
+            NotSupportedError = ()
+
+        try:
+            batches = list(fetch_arrow_batches())
+        except NotSupportedError:
+            # Result came back as JSON (e.g. a SHOW command), not Arrow
+            batches = None
+    rows = cur.fetchall() if batches is None else None
+    fetched = time.perf_counter()
+
+    if batches:
+        import pyarrow as pa
+
+        table = pa.concat_tables(batches)
+        timings["result_bytes"] = table.nbytes
+        frame = arrow_table_to_frame(table, columns)
+    else:
+        frame = rows_to_frame(rows or [], columns)
+        timings["result_bytes"] = int(frame.memory_usage(deep=True).sum())
+    timings["fetch_ms"] = (fetched - start) * 1000
+    timings["build_ms"] = (time.perf_counter() - fetched) * 1000
+    return frame
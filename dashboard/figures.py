@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from dashboard.states import us_state_abbr
+
+
+# Content fingerprint of the frame a figure is drawn from; a new data
+# version means a different fingerprint, nothing else does
+def frame_fingerprint(frame):
+    import pandas as pd
+
+    digest = hashlib.sha1()
+    digest.update(repr(list(frame.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Plotly figures keyed by (section, data fingerprint), shared by every
+    session and rerun. Callers that know the table version the frame was
+    computed from (dashboard/versioning.py) pass it as `version` and the
+    frame is not hashed at all.
+
+    Cached figures are only ever read, so one object can be handed to many
+    sessions at once. For each section the cache remembers how long the
+    figure took to build on its last miss and adds that to `saved_ms` on
+    every hit. `serialize_ms` is the JSON encoding cost measured on the same
+    miss; st.plotly_chart still pays it on each render, so it is reported
+    but not counted as saved.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _section_stats(self, section):
+        return self._stats.setdefault(section, {
+            "hits": 0, "misses": 0, "build_ms": 0.0, "serialize_ms": 0.0, "saved_ms": 0.0,
+        })
+
+    def get_or_build(self, section, frame, build, version=None):
+        key = (section, frame_fingerprint(frame) if version is None else ("version", version))
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                stats = self._section_stats(section)
+                stats["hits"] += 1
+                stats["saved_ms"] += stats["build_ms"]
+                return fig
+
+        start = time.perf_counter()
+        fig = build(frame)
+        built = time.perf_counter()
+        # Serialising once up front measures the cost and surfaces a broken
+        # figure here, before it is shared with other sessions
+        fig.to_json()
+        serialized = time.perf_counter()
+
+        with self._lock:
+            self._figures[key] = fig
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+            stats = self._section_stats(section)
+            stats["misses"] += 1
+            stats["build_ms"] = (built - start) * 1000
+            stats["serialize_ms"] = (serialized - built) * 1000
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+    def stats(self):
+        with self._lock:
+            return {section: dict(s) for section, s in self._stats.items()}
+
+
+# Shared by every session in this server process
+figure_cache = FigureCache()
+
+
+# A section's national map: `build` draws it from `frame` (one row per
+# STATE) once the plotly state codes are added, and it comes from the figure
+# cache while `version` is unchanged
+def national_map(section, frame, build, version=None):
+    frame["STATE_CODE"] = frame["STATE"].map(us_state_abbr)
+    frame = frame.dropna(subset=["STATE_CODE"])
+    return figure_cache.get_or_build(section, frame, build, version=version)
@@ -0,0 +1,119 @@
+"""Per-query timings, kept in memory and written to a structured log.
+
+Every statement run through dashboard.executor adds one record:
+
+    statement, query_id (Snowflake's sfqid, None locally), connect_ms (lease
+    wait plus any new login), execute_ms (compile + execute; the connector
+    blocks until the query finishes), fetch_ms, build_ms (DataFrame
+    construction), rows, result_bytes, error
+
+and, once Snowflake's query history has it, compile_ms (see
+dashboard/compile_times.py).
+
+Records go to the "dashboard.queries" logger as one JSON object per line and
+to a bounded in-memory log that the sidebar Performance panel reads.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("dashboard.queries")
+
+
+class QueryLog:
+    def __init__(self, max_records=200):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, **fields):
+        fields.setdefault("at", time.time())
+        with self._lock:
+            self._records.append(fields)
+        logger.info(json.dumps(fields, default=str))
+        return fields
+
+    # Records that have a Snowflake query_id but no `field` yet
+    def awaiting(self, field):
+        with self._lock:
+            return [r for r in self._records if r.get("query_id") and field not in r]
+
+    def update(self, record, **fields):
+        with self._lock:
+            record.update(fields)
+
+    def recent(self, limit=50):
+        with self._lock:
+            return list(self._records)[-limit:][::-1]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+# Shared by every session in this server process
+query_log = QueryLog()
+
+
+def panel_enabled():
+    return os.environ.get("DASHBOARD_PERF_PANEL", "0") == "1"
+
+
+# `attr` of module `name` if that module has been imported, else None. The
+# warmup thread may be importing it right now, in which case the module is
+# already in sys.modules but the attribute may not exist yet.
+def _loaded(name, attr):
+    return getattr(sys.modules.get(name), attr, None)
+
+
+# Collapsible sidebar panel with recent queries and cache statistics. Only
+# reports on modules that are already loaded, so it never pulls pandas or
+# plotly into a page that didn't need them.
+def render_performance_panel():
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        records = query_log.recent()
+        st.caption(f"Last {len(records)} queries (newest first)")
+        if records:
+            columns = ["statement", "query_id", "connect_ms", "execute_ms", "compile_ms", "fetch_ms",
+                       "build_ms", "rows", "result_bytes", "error"]
+            st.dataframe([{c: r.get(c) for c in columns} for r in records], use_container_width=True)
+
+        stats = {}
+        query_cache = _loaded("dashboard.result_cache", "query_cache")
+        if query_cache is not None:
+            stats["query cache"] = query_cache.stats()
+        figure_cache = _loaded("dashboard.figures", "figure_cache")
+        if figure_cache is not None:
+            stats["figure cache"] = figure_cache.stats()
+        get_pool = _loaded("dashboard.data", "get_pool")
+        if get_pool is not None:
+            stats["connection pool"] = get_pool().stats()
+        get_table_version = _loaded("dashboard.data", "get_table_version")
+        if get_table_version is not None:
+            stats["table version"] = get_table_version().stats()
+        disk_cache = _loaded("dashboard.disk_cache", "disk_cache")
+        if disk_cache is not None:
+            stats["disk cache"] = disk_cache.stats()
+        shared_cache = _loaded("dashboard.shared_cache", "shared_cache")
+        if shared_cache is not None:
+            stats["shared cache"] = shared_cache.stats()
+        in_flight = _loaded("dashboard.executor", "in_flight")
+        if in_flight is not None:
+            stats["single-flight"] = in_flight.stats()
+        statements = _loaded("dashboard.statements", "statements")
+        if statements is not None:
+            stats["statements"] = statements.stats()
+        credentials = _loaded("dashboard.credentials", "credentials")
+        if credentials is not None:
+            stats["credentials"] = credentials.stats()
+        last_results = _loaded("dashboard.warmup", "last_results")
+        if last_results is not None:
+            stats["warmup"] = last_results
+        for name, value in stats.items():
+            st.caption(name)
+            st.json(value, expanded=False)
@@ -0,0 +1,3 @@
+# One module per sidebar section, each exposing render(). app1.py imports a
+# page the first time it is visited, so a page's dependencies (pandas,
+# plotly, the Snowflake connector) are only loaded once somebody needs them.
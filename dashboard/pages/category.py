@@ -0,0 +1,42 @@
+"""Category Analytics: category counts per state, with a per-state drill-down."""
+import plotly.express as px
+import streamlit as st
+
+from dashboard.data import load_cube_snapshot, show_data_as_of
+from dashboard.drilldowns import category_drilldown
+from dashboard.figures import national_map
+
+
+# Cached per data version by dashboard/figures.py
+def category_figure(state_summary):
+    fig = px.choropleth(
+        state_summary,
+        locations="STATE_CODE",
+        locationmode="USA-states",
+        color="CATEGORY_COUNT",
+        color_continuous_scale="Plasma",
+        hover_name="STATE",
+        hover_data={"STATE_CODE": False, "CATEGORY_COUNT": True},
+        scope="usa",
+        title="<b>📦 Total Category Subscriptions by State</b>"
+    )
+    fig.update_layout(coloraxis_colorbar=dict(title="🔢 Categories"))
+    return fig
+
+
+# The national map and when its data was computed
+def national_figure():
+    cube, as_of, version = load_cube_snapshot()
+    cat_data = cube.by_state_category()
+    state_summary = cat_data.groupby("STATE", observed=True)["CATEGORY_COUNT"].sum().reset_index()
+    return national_map("Category Analytics", state_summary, category_figure, version), as_of
+
+
+def render():
+    fig, as_of = national_figure()
+
+    st.title("📦 Category Analytics - Nationwide View")
+    st.plotly_chart(fig, use_container_width=True)
+    show_data_as_of(as_of)
+
+    category_drilldown()
@@ -0,0 +1,37 @@
+"""Heatmap Overview: total entries per state."""
+import plotly.express as px
+import streamlit as st
+
+from dashboard.data import load_cube_snapshot, show_data_as_of
+from dashboard.figures import national_map
+
+
+# Cached per data version by dashboard/figures.py
+def heatmap_figure(df):
+    fig = px.choropleth(
+        df,
+        locations="STATE_CODE",
+        locationmode="USA-states",
+        color="ENTRY_COUNT",
+        hover_name="STATE",
+        hover_data={"STATE_CODE": False, "ENTRY_COUNT": True},
+        scope="usa",
+        color_continuous_scale="Turbo",
+        title="📍 Total Testosterone-Related Entries by State"
+    )
+    fig.update_layout(coloraxis_colorbar=dict(title="🧬 Entries"))
+    return fig
+
+
+# The national map and when its data was computed
+def national_figure():
+    cube, as_of, version = load_cube_snapshot()
+    return national_map("Heatmap Overview", cube.by_state(), heatmap_figure, version), as_of
+
+
+def render():
+    fig, as_of = national_figure()
+
+    st.title("📊 Total Testosterone Records Across the U.S.")
+    st.plotly_chart(fig, use_container_width=True)
+    show_data_as_of(as_of)
@@ -0,0 +1,17 @@
+"""Landing page; deliberately imports nothing but streamlit."""
+import streamlit as st
+
+
+def render():
+    st.title("🏥 Kaiser Permanente Cost Analysis")
+    st.success("✅ Data successfully imported and analyzed.")
+    st.markdown("""
+        This app provides an interactive breakdown of testosterone-related negotiated rates by:
+
+        - 📍 **State**  
+        - 📦 **Drug Category** (Gel, Injection, Patch, etc.)  
+        - 💰 **Negotiated Rate Type** (Fixed, Percentage, etc.)
+
+        👉 Use the sidebar to explore the full analytics.
+    """)
+    st.markdown("---")
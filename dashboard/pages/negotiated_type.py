@@ -0,0 +1,54 @@
+"""Negotiated Type Breakdown: negotiated-rate types per state, with a per-state drill-down."""
+import plotly.express as px
+import streamlit as st
+
+from dashboard.data import load_type_pivot_snapshot, show_data_as_of
+from dashboard.drilldowns import negotiated_type_drilldown
+from dashboard.figures import national_map
+
+
+# Cached per data version by dashboard/figures.py
+def negotiated_type_figure(hover_info):
+    fig = px.choropleth(
+        hover_info,
+        locations="STATE_CODE",
+        locationmode="USA-states",
+        color="TOTAL_NEGOTIATED_TYPE",
+        color_continuous_scale="Cividis",
+        scope="usa",
+        hover_name="STATE",
+        hover_data={
+            "STATE_CODE": False,
+            "TOTAL_NEGOTIATED_TYPE": True,
+            "derived": "derived" in hover_info.columns,
+            "negotiated": "negotiated" in hover_info.columns,
+            "percentage": "percentage" in hover_info.columns,
+            "per diem": "per diem" in hover_info.columns
+        },
+        title="<b>📍 Total NEGOTIATED_TYPE Entries by State</b>"
+    )
+    fig.update_layout(coloraxis_colorbar=dict(title="🧾 Entry Types"))
+    return fig
+
+
+# The national map and when its data was computed
+def national_figure():
+    # Already wide, with TOTAL_NEGOTIATED_TYPE, straight from the warehouse
+    hover_info, as_of, version = load_type_pivot_snapshot()
+    return national_map("Negotiated Type Breakdown", hover_info, negotiated_type_figure, version), as_of
+
+
+def render():
+    fig, as_of = national_figure()
+
+    st.title("💰 Negotiated Type Breakdown")
+    st.plotly_chart(fig, use_container_width=True)
+    show_data_as_of(as_of)
+
+    negotiated_type_drilldown()
+    st.markdown("""
+    - **negotiated**: A fixed, direct amount agreed upon (e.g., $53.25)  
+    - **percentage**: A percentage of billed charges (e.g., 80%)  
+    - **per diem**: A daily rate (e.g., $500 per day)  
+    - **derived**: Estimated from other values  
+    """)
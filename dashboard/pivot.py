@@ -0,0 +1,58 @@
+"""Negotiated-type counts per state, pivoted by the warehouse.
+
+The Negotiated Type Breakdown map needs one row per state and one column per
+NEGOTIATED_TYPE. Instead of fetching long rows and pivoting them in pandas,
+the statement does the pivot with conditional aggregation, one
+SUM(CASE WHEN NEGOTIATED_TYPE = ? ...) per type. The types come from the
+dimension catalog and are passed as bind parameters; the result columns are
+positional (TYPE_0_COUNT, ...) and renamed to the type values after the
+fetch, so no value is ever spliced into the SQL text. Conditional
+aggregation rather than PIVOT keeps the statement portable to the local
+SQLite / DuckDB stand-ins.
+"""
+import logging
+
+from dashboard.rollups import SOURCE_TABLE, SUMMARY_STATE_CATEGORY_TYPE, is_missing_table
+from dashboard.statements import statements
+
+logger = logging.getLogger(__name__)
+
+TOTAL_COLUMN = "TOTAL_NEGOTIATED_TYPE"
+
+
+# The registered statement for `count` types, reading `table`. `measure` is
+# the column to sum (ENTRY_COUNT in the summary table) or None to count raw rows.
+def pivot_statement(count, table=SUMMARY_STATE_CATEGORY_TYPE, measure="ENTRY_COUNT"):
+    value = measure or "1"
+    cases = "".join(
+        f",\n        SUM(CASE WHEN NEGOTIATED_TYPE = ? THEN {value} ELSE 0 END) AS TYPE_{i}_COUNT"
+        for i in range(count)
+    )
+    total = f"SUM({measure})" if measure else "COUNT(*)"
+    name = "types_by_state" if measure else "types_by_state_raw"
+    return statements.register(f"{name}_{count}", f"""
+        SELECT STATE{cases},
+        {total} AS TOTAL_COUNT
+        FROM {table}
+        WHERE STATE IS NOT NULL AND CATEGORY IS NOT NULL AND NEGOTIATED_TYPE IS NOT NULL
+        GROUP BY STATE
+        ORDER BY STATE
+    """, ["STATE"] + [f"TYPE_{i}_COUNT" for i in range(count)] + ["TOTAL_COUNT"])
+
+
+# Fetch the wide table with `fetch(statement, params)`, preferring the summary
+# table and falling back to the raw one if it hasn't been built. Columns: STATE, one per type, TOTAL_NEGOTIATED_TYPE.
+def load_types_by_state(fetch, types):
+    types = list(types)
+    try:
+        statement = pivot_statement(len(types))
+        frame = fetch(statement, types)
+    except Exception as exc:
+        if not is_missing_table(exc):
+            raise
+        logger.warning("%s not built yet, pivoting the raw table instead", SUMMARY_STATE_CATEGORY_TYPE)
+        statement = pivot_statement(len(types), SOURCE_TABLE, measure=None)
+        frame = fetch(statement, types)
+    names = {f"TYPE_{i}_COUNT": t for i, t in enumerate(types)}
+    names["TOTAL_COUNT"] = TOTAL_COLUMN
+    return frame.rename(columns=names)
@@ -0,0 +1,226 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Snowflake errnos raised when the session or its auth token has expired
+TOKEN_EXPIRED_ERRNOS = {390112, 390114}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def is_token_expired(exc):
+    return getattr(exc, "errno", None) in TOKEN_EXPIRED_ERRNOS
+
+
+# DB-API errors that may mean the connection itself is broken rather than
+# the statement. Matched by name so it covers sqlite3, DuckDB and the
+# Snowflake connector without importing them.
+def is_connection_error(exc):
+    return any(cls.__name__ in ("OperationalError", "InterfaceError") for cls in type(exc).__mro__)
+
+
+class _Entry:
+    def __init__(self, conn, now):
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+        # Set after a connection-level error; forces a health check on the next checkout
+        self.suspect = False
+
+
+class ConnectionPool:
+    """A small thread-safe pool of DB-API connections.
+
+    At most `size` connections are open at once. Idle connections are kept
+    on a stack so the most recently used (and warmest) one is handed out
+    first, closed after `max_idle` seconds without use (checked on every
+    acquire, and on a timer once evict_periodically() is started), and
+    recycled after
+    `max_lifetime` seconds so they are replaced before the Snowflake session
+    token runs out. A connection that has sat idle longer than
+    `check_after` seconds, or whose last use raised a connection-level
+    error, is health-checked before it is handed out.
+    """
+
+    def __init__(self, connect, size=4, max_idle=600, max_lifetime=4 * 3600,
+                 check_after=60, timeout=30, clock=time.monotonic):
+        self._connect = connect
+        self._clock = clock
+        self.size = size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.timeout = timeout
+        self._idle = []
+        self._open = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._closed = threading.Event()
+        self._stats = {"created": 0, "reused": 0, "evicted": 0, "failed_checks": 0, "reconnects": 0}
+
+    # --- connection lifecycle ---
+
+    def _close(self, entry):
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def _healthy(self, entry):
+        conn = entry.conn
+        is_closed = getattr(conn, "is_closed", None)
+        if is_closed is not None and is_closed():
+            return False
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+                cur.fetchall()
+            finally:
+                cur.close()
+        except Exception:
+            return False
+        return True
+
+    def _expired(self, entry, now):
+        return (now - entry.last_used > self.max_idle
+                or now - entry.created_at > self.max_lifetime)
+
+    # Close idle connections that have outlived max_idle / max_lifetime.
+    # Caller must hold the lock.
+    def _evict_locked(self, now):
+        keep = []
+        stale = []
+        for entry in self._idle:
+            (stale if self._expired(entry, now) else keep).append(entry)
+        self._idle = keep
+        self._open -= len(stale)
+        self._stats["evicted"] += len(stale)
+        return stale
+
+    def evict_idle(self):
+        with self._lock:
+            stale = self._evict_locked(self._clock())
+            if stale:
+                self._available.notify_all()
+        for entry in stale:
+            self._close(entry)
+        return len(stale)
+
+    # Run evict_idle() every `interval` seconds on a daemon thread until the
+    # pool is closed, so a server with no traffic still logs its idle
+    # sessions out instead of holding them until the next acquire()
+    def evict_periodically(self, interval):
+        def loop():
+            while not self._closed.wait(interval):
+                self.evict_idle()
+
+        thread = threading.Thread(target=loop, name="dashboard-pool-evict", daemon=True)
+        thread.start()
+        return thread
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self._lock:
+            stale = self._evict_locked(self._clock())
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"no connection available after {self.timeout}s")
+                self._available.wait(remaining)
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                self._open += 1
+        for old in stale:
+            self._close(old)
+
+        if entry is not None:
+            fresh = not entry.suspect and self._clock() - entry.last_used < self.check_after
+            if fresh or self._healthy(entry):
+                entry.suspect = False
+                with self._lock:
+                    self._stats["reused"] += 1
+                return entry
+            self._close(entry)
+            with self._lock:
+                self._stats["failed_checks"] += 1
+
+        # Either the pool had room for a new connection or the idle one failed
+        # its health check; in both cases this slot is already counted in _open.
+        try:
+            entry = _Entry(self._connect(), self._clock())
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._stats["created"] += 1
+        return entry
+
+    def release(self, entry, discard=False):
+        if discard:
+            self._close(entry)
+            with self._lock:
+                self._open -= 1
+                self._available.notify()
+            return
+        entry.last_used = self._clock()
+        with self._lock:
+            self._idle.append(entry)
+            self._available.notify()
+
+    # --- public helpers ---
+
+    @contextmanager
+    def connection(self):
+        entry = self.acquire()
+        discard = False
+        try:
+            yield entry.conn
+        except Exception as exc:
+            # A failed statement does not poison the session, but an expired
+            # token does: drop it so the next caller gets a fresh login. A
+            # connection-level error may or may not have (sqlite3 raises
+            # OperationalError for a missing table too), so that connection
+            # is checked before anyone gets it again.
+            if is_connection_error(exc):
+                entry.suspect = True
+            discard = is_token_expired(exc)
+            raise
+        except BaseException:
+            # Interrupted mid-statement (KeyboardInterrupt, or Streamlit
+            # stopping the script for a rerun): check it before reuse
+            entry.suspect = True
+            raise
+        finally:
+            self.release(entry, discard=discard)
+
+    # Call fn(conn) on a pooled connection, reconnecting once if the
+    # session token turned out to have expired.
+    def run(self, fn):
+        try:
+            with self.connection() as conn:
+                return fn(conn)
+        except Exception as exc:
+            if not is_token_expired(exc):
+                raise
+        with self._lock:
+            self._stats["reconnects"] += 1
+        with self.connection() as conn:
+            return fn(conn)
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._available.notify_all()
+        for entry in idle:
+            self._close(entry)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, open=self._open, idle=len(self._idle), size=self.size)
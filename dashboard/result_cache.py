@@ -0,0 +1,187 @@
+import hashlib
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from dashboard.singleflight import SingleFlight, copy_result
+
+logger = logging.getLogger(__name__)
+
+
+# Collapse whitespace and drop a trailing semicolon so that queries differing
+# only in layout share a cache entry. String literals are left untouched.
+def normalize_sql(sql):
+    parts = re.split(r"('(?:[^']|'')*')", sql.strip().rstrip(";"))
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", parts[i])
+    return "".join(parts).strip()
+
+
+def make_key(sql, params=None):
+    raw = normalize_sql(sql) + "\0" + repr(params)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def estimate_size(value):
+    memory_usage = getattr(value, "memory_usage", None)
+    if memory_usage is not None:
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        except TypeError:
+            pass
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "computed_at", "version")
+
+    def __init__(self, value, size, expires_at, computed_at, version=None):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.computed_at = computed_at
+        self.version = version
+
+
+# Run `fn` on a daemon thread
+def _spawn_thread(fn):
+    threading.Thread(target=fn, name="dashboard-revalidate", daemon=True).start()
+
+
+class ResultCache:
+    """Process-wide LRU cache of query results with a TTL and a memory cap.
+
+    Entries are evicted least-recently-used first once their combined size
+    passes `max_bytes`. Lookups go through get_or_revalidate, which serves
+    entries older than `ttl` seconds, or computed at an older data version,
+    stale while it refreshes them. Values are copied on the way out so
+    callers can add columns to the frames they get back without corrupting
+    the cached copy.
+
+    Concurrent cold misses on one key are coalesced (see
+    dashboard/singleflight.py): the first runs `compute` and stores the
+    result, the rest wait for it, so a burst of sessions opening the same
+    page computes it once.
+    """
+
+    def __init__(self, ttl=6 * 3600, max_bytes=256 * 1024 * 1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._in_flight = SingleFlight()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0,
+                       "stale": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _drop_locked(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def put(self, key, value, ttl=None, version=None):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = _Entry(value, size, expires_at, time.time(), version)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop_locked(oldest)
+                self._stats["evictions"] += 1
+
+    # compute() and store its result, once per key however many callers miss
+    # at the same time (a cold miss in get_or_revalidate). A caller that arrives just after the first one has
+    # stored its result finds it instead of computing again.
+    def _fill(self, key, compute, ttl, version):
+        def fill():
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at > self._clock() and entry.version == version:
+                    return entry.value
+            value = compute()
+            self.put(key, value, ttl=ttl, version=version)
+            return value
+
+        return copy_result(self._in_flight.do(key, fill))
+
+    # Stale-while-revalidate. Returns (value, computed_at, version): the
+    # wall-clock time the value was produced and the data `version` it was
+    # computed at. The version is recorded in the entry rather than the key,
+    # so only a cold miss waits for `compute`: an entry that has expired or
+    # was computed at another version is returned as-is and `compute` is
+    # started in the background via `spawn`, at most once per key at a time.
+    # If the refresh fails the stale value stays and the next call retries.
+    def get_or_revalidate(self, sql, params, compute, ttl=None, spawn=_spawn_thread, version=None):
+        key = make_key(sql, params)
+        refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                if entry.expires_at > self._clock() and entry.version == version:
+                    self._stats["hits"] += 1
+                else:
+                    self._stats["stale"] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        refresh = True
+                value, computed_at, served_version = entry.value, entry.computed_at, entry.version
+
+        if entry is None:
+            return self._fill(key, compute, ttl, version), time.time(), version
+
+        if refresh:
+            def revalidate():
+                try:
+                    self.put(key, compute(), ttl=ttl, version=version)
+                    self._count("refreshes")
+                except Exception:
+                    self._count("refresh_errors")
+                    logger.warning("background refresh failed; still serving the stale result", exc_info=True)
+                finally:
+                    with self._lock:
+                        self._refreshing.discard(key)
+
+            try:
+                spawn(revalidate)
+            except Exception:
+                with self._lock:
+                    self._refreshing.discard(key)
+                raise
+        return copy_result(value), computed_at, served_version
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        coalesced = self._in_flight.stats()["coalesced"]
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                coalesced=coalesced,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                hit_rate=self._stats["hits"] / lookups if lookups else 0.0,
+            )
+
+
+# Shared by every session in this server process
+query_cache = ResultCache(
+    ttl=float(os.environ.get("DASHBOARD_CACHE_TTL", 6 * 3600)),
+    max_bytes=int(float(os.environ.get("DASHBOARD_CACHE_MAX_MB", 256)) * 1024 * 1024),
+)
@@ -0,0 +1,188 @@
+"""Materialised summary tables over ALL_STATE_COMBINED.
+
+The finest rollup (state x category x negotiated type, NULL groups included)
+is rebuilt or incrementally extended from the raw table; the state x
+category and state rollups are then re-derived from it, which costs a few
+thousand rows rather than a scan of the raw table.
+
+Change detection uses a metadata table recording the raw row count and, if
+a watermark column is configured (DASHBOARD_SUMMARY_WATERMARK, e.g. a load
+timestamp), the highest watermark seen. With a watermark only rows above the
+previous one are aggregated and added in; without one any change in row
+count triggers a full rebuild. Either way an unchanged table is a no-op.
+
+    python -m dashboard.rollups            # refresh if the raw table changed
+    python -m dashboard.rollups --full     # force a full rebuild
+"""
+import argparse
+import datetime
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TABLE = "ALL_STATE_COMBINED"
+SUMMARY_STATE = "ALL_STATE_SUMMARY_STATE"
+SUMMARY_STATE_CATEGORY = "ALL_STATE_SUMMARY_STATE_CATEGORY"
+SUMMARY_STATE_CATEGORY_TYPE = "ALL_STATE_SUMMARY_STATE_CATEGORY_TYPE"
+SUMMARY_META = "ALL_STATE_SUMMARY_META"
+
+WATERMARK_COLUMN = os.environ.get("DASHBOARD_SUMMARY_WATERMARK") or None
+
+_KEYS = "STATE, CATEGORY, NEGOTIATED_TYPE"
+
+# Snowflake's "Object ... does not exist or not authorized"
+MISSING_OBJECT_ERRNOS = {2003}
+
+
+# True if `exc` says the table a statement reads doesn't exist, which is how a
+# summary table that hasn't been built yet shows up: Snowflake errno 2003,
+# SQLite's "no such table", DuckDB's "Table with name ... does not exist".
+# Anything else (a dropped connection, a timeout, a typo in the SQL) is not
+# a reason to fall back to the raw table.
+def is_missing_table(exc):
+    if getattr(exc, "errno", None) in MISSING_OBJECT_ERRNOS:
+        return True
+    message = str(exc).lower()
+    return "no such table" in message or "does not exist" in message
+
+
+def _scalar(cur, sql, params=None):
+    if params is None:
+        cur.execute(sql)
+    else:
+        cur.execute(sql, params)
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+# Build `table` from a SELECT into a side table, then swap it in
+def _replace(cur, table, select_sql, params=None):
+    cur.execute(f"DROP TABLE IF EXISTS {table}_NEW")
+    create = f"CREATE TABLE {table}_NEW AS {select_sql}"
+    if params is None:
+        cur.execute(create)
+    else:
+        cur.execute(create, params)
+    cur.execute(f"DROP TABLE IF EXISTS {table}")
+    cur.execute(f"ALTER TABLE {table}_NEW RENAME TO {table}")
+
+
+def _read_meta(cur):
+    cur.execute(f"CREATE TABLE IF NOT EXISTS {SUMMARY_META} (SOURCE_ROWS BIGINT, WATERMARK VARCHAR, REFRESHED_AT VARCHAR)")
+    cur.execute(f"SELECT SOURCE_ROWS, WATERMARK FROM {SUMMARY_META}")
+    row = cur.fetchone()
+    if row is None:
+        return None
+    try:
+        cur.execute(f"SELECT 1 FROM {SUMMARY_STATE_CATEGORY_TYPE} WHERE 1 = 0")
+        cur.fetchall()
+    except Exception:
+        # Metadata without the summary itself: treat as never built
+        return None
+    return {"rows": row[0], "watermark": row[1]}
+
+
+def _write_meta(cur, source_rows, watermark):
+    refreshed_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    cur.execute(f"DELETE FROM {SUMMARY_META}")
+    cur.execute(
+        f"INSERT INTO {SUMMARY_META} (SOURCE_ROWS, WATERMARK, REFRESHED_AT) VALUES (?, ?, ?)",
+        (source_rows, watermark, refreshed_at),
+    )
+
+
+def refresh_summaries(conn, watermark_column=WATERMARK_COLUMN, full=False):
+    """Bring the summary tables up to date with ALL_STATE_COMBINED.
+
+    Returns a dict with the mode used ("skipped", "incremental" or "full"),
+    the raw row count and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    cur = conn.cursor()
+    try:
+        meta = _read_meta(cur)
+        source_rows = _scalar(cur, f"SELECT COUNT(*) FROM {SOURCE_TABLE}")
+        watermark = None
+        if watermark_column:
+            watermark = _scalar(cur, f"SELECT MAX({watermark_column}) FROM {SOURCE_TABLE}")
+            watermark = None if watermark is None else str(watermark)
+
+        mode = "full"
+        if meta is not None and not full:
+            if source_rows == meta["rows"] and watermark == meta["watermark"]:
+                mode = "skipped"
+            elif watermark_column and meta["watermark"] is not None and watermark is not None:
+                new_rows = _scalar(
+                    cur,
+                    f"SELECT COUNT(*) FROM {SOURCE_TABLE} WHERE {watermark_column} > ? AND {watermark_column} <= ?",
+                    (meta["watermark"], watermark),
+                )
+                # Anything other than a pure append above the old watermark
+                # (deletes, late rows, reloads) needs a full rebuild
+                if meta["rows"] + new_rows == source_rows:
+                    mode = "incremental"
+
+        if mode == "full":
+            _replace(cur, SUMMARY_STATE_CATEGORY_TYPE, f"""
+                SELECT {_KEYS}, COUNT(*) AS ENTRY_COUNT
+                FROM {SOURCE_TABLE}
+                GROUP BY {_KEYS}
+            """)
+        elif mode == "incremental":
+            _replace(cur, SUMMARY_STATE_CATEGORY_TYPE, f"""
+                SELECT {_KEYS}, SUM(ENTRY_COUNT) AS ENTRY_COUNT
+                FROM (
+                    SELECT {_KEYS}, ENTRY_COUNT FROM {SUMMARY_STATE_CATEGORY_TYPE}
+                    UNION ALL
+                    SELECT {_KEYS}, COUNT(*) AS ENTRY_COUNT
+                    FROM {SOURCE_TABLE}
+                    WHERE {watermark_column} > ? AND {watermark_column} <= ?
+                    GROUP BY {_KEYS}
+                ) AS merged
+                GROUP BY {_KEYS}
+            """, (meta["watermark"], watermark))
+
+        if mode != "skipped":
+            _replace(cur, SUMMARY_STATE_CATEGORY, f"""
+                SELECT STATE, CATEGORY, SUM(ENTRY_COUNT) AS ENTRY_COUNT
+                FROM {SUMMARY_STATE_CATEGORY_TYPE}
+                GROUP BY STATE, CATEGORY
+            """)
+            _replace(cur, SUMMARY_STATE, f"""
+                SELECT STATE, SUM(ENTRY_COUNT) AS ENTRY_COUNT
+                FROM {SUMMARY_STATE_CATEGORY_TYPE}
+                GROUP BY STATE
+            """)
+            _write_meta(cur, source_rows, watermark)
+        conn.commit()
+    finally:
+        cur.close()
+
+    result = {"mode": mode, "source_rows": source_rows, "seconds": time.perf_counter() - start}
+    logger.info("summary refresh: %(mode)s over %(source_rows)s rows in %(seconds).2fs", result)
+    return result
+
+
+def main():
+    import streamlit as st
+
+    from dashboard.backends import get_backend
+    from dashboard.credentials import credentials
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="rebuild from scratch even if nothing changed")
+    parser.add_argument("--watermark", default=WATERMARK_COLUMN, help="watermark column for incremental refresh")
+    args = parser.parse_args()
+
+    conn = get_backend(st.secrets, credentials).connect()
+    try:
+        result = refresh_summaries(conn, watermark_column=args.watermark, full=args.full)
+    finally:
+        conn.close()
+    print(f"{result['mode']}: {result['source_rows']:,} source rows in {result['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Query results shared between replicas of the app through a Redis-style
+key-value store.
+
+Every replica behind the load balancer has its own in-memory and on-disk
+caches; this tier sits behind them, so a result one replica fetched from
+the warehouse is reused by the others. Frames are stored as zstd-compressed
+Arrow IPC streams with a TTL, and the schema metadata records which replica
+wrote them, so a hit on another replica's result can be counted as a
+cross-replica hit.
+
+DASHBOARD_SHARED_CACHE_URL picks the store:
+
+    redis://host:6379/0   a Redis server (needs the redis package)
+    fakeredis://          fakeredis, in-process (needs the fakeredis package)
+    memory://             InProcessStore below, in-process
+
+Unset, the tier is off. Any store needs only get / set(ex=) / incr, which
+redis-py and fakeredis already provide. A store that is down is logged and
+treated as a miss; pages never fail because of it.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+REPLICA_METADATA_KEY = b"dashboard.replica"
+
+
+class InProcessStore:
+    """The subset of the Redis API the shared cache uses, in a dict."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, None if ex is None else self._clock() + ex)
+        return True
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value, expires_at = self._data.get(key, (b"0", None))
+            value = str(int(value) + amount).encode()
+            self._data[key] = (value, expires_at)
+            return int(value)
+
+
+def serialize_frame(frame, replica):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[REPLICA_METADATA_KEY] = replica.encode()
+    table = table.replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression="zstd")) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# Returns (frame, replica that wrote it)
+def deserialize_frame(payload):
+    import pyarrow as pa
+
+    from dashboard.fetch import apply_dtypes
+
+    table = pa.ipc.open_stream(pa.py_buffer(payload)).read_all()
+    replica = (table.schema.metadata or {}).get(REPLICA_METADATA_KEY, b"").decode()
+    return apply_dtypes(table.to_pandas()), replica
+
+
+class SharedCache:
+    """Frames in a shared store, keyed by the caller (query key plus table
+    version), expiring after `ttl` seconds.
+
+    Local counters cover this replica; the store also keeps fleet-wide
+    hit / miss counters under `<prefix>stats:*`, so `stats()` reports both.
+    """
+
+    def __init__(self, store, replica=None, ttl=6 * 3600, prefix="dashboard:"):
+        self.store = store
+        self.replica = replica or f"{socket.gethostname()}:{os.getpid()}"
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "cross_replica_hits": 0, "misses": 0, "writes": 0, "errors": 0,
+                       "bytes_read": 0, "bytes_written": 0}
+
+    def _count(self, name, amount=1, shared=False):
+        with self._lock:
+            self._stats[name] += amount
+        if shared:
+            try:
+                self.store.incr(f"{self.prefix}stats:{name}")
+            except Exception:
+                logger.debug("could not update shared counter %s", name, exc_info=True)
+
+    def get(self, key):
+        try:
+            payload = self.store.get(f"{self.prefix}result:{key}")
+        except Exception:
+            logger.warning("shared cache unavailable; treating as a miss", exc_info=True)
+            self._count("errors")
+            return None
+        if payload is None:
+            self._count("misses", shared=True)
+            return None
+        try:
+            frame, writer = deserialize_frame(payload)
+        except Exception:
+            logger.warning("unreadable shared cache entry %s; treating as a miss", key, exc_info=True)
+            self._count("errors")
+            return None
+        self._count("hits", shared=True)
+        self._count("bytes_read", len(payload))
+        if writer != self.replica:
+            self._count("cross_replica_hits", shared=True)
+        return frame
+
+    def put(self, key, frame, ttl=None):
+        try:
+            payload = serialize_frame(frame, self.replica)
+            self.store.set(f"{self.prefix}result:{key}", payload, ex=int(self.ttl if ttl is None else ttl))
+        except Exception:
+            logger.warning("could not write to the shared cache", exc_info=True)
+            self._count("errors")
+            return
+        self._count("writes")
+        self._count("bytes_written", len(payload))
+
+    def get_or_compute(self, key, compute, ttl=None):
+        frame = self.get(key)
+        if frame is None:
+            frame = compute()
+            self.put(key, frame, ttl=ttl)
+        return frame
+
+    def fleet_stats(self):
+        counters = {}
+        for name in ("hits", "cross_replica_hits", "misses"):
+            try:
+                value = self.store.get(f"{self.prefix}stats:{name}")
+            except Exception:
+                return {}
+            counters[name] = int(value or 0)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        counters["cross_replica_hit_rate"] = counters["cross_replica_hits"] / lookups if lookups else 0.0
+        return counters
+
+    def stats(self):
+        with self._lock:
+            local = dict(self._stats)
+        lookups = local["hits"] + local["misses"]
+        local["hit_rate"] = local["hits"] / lookups if lookups else 0.0
+        return {"replica": self.replica, "local": local, "fleet": self.fleet_stats()}
+
+
+def store_from_url(url):
+    if url.startswith("memory://"):
+        return InProcessStore()
+    if url.startswith("fakeredis://"):
+        import fakeredis
+
+        return fakeredis.FakeRedis()
+    import redis
+
+    return redis.Redis.from_url(url)
+
+
+# Shared by every session in this server process; None unless configured
+shared_cache = None
+if os.environ.get("DASHBOARD_SHARED_CACHE_URL"):
+    shared_cache = SharedCache(
+        store_from_url(os.environ["DASHBOARD_SHARED_CACHE_URL"]),
+        replica=os.environ.get("DASHBOARD_REPLICA_ID"),
+        ttl=float(os.environ.get("DASHBOARD_CACHE_TTL", 6 * 3600)),
+    )
@@ -0,0 +1,67 @@
+import threading
+
+
+# A copy of a result that is handed to more than one caller (frames and
+# other values with .copy()), so no caller can mutate another's
+def copy_result(value):
+    return value.copy() if hasattr(value, "copy") else value
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key runs `fn`; callers that arrive while it is
+    still running wait for it and get the same result (a copy, for values
+    that have one) or the same exception. Nothing is remembered once the
+    call finishes, so this is not a cache, only a guard against a burst of
+    identical requests all reaching the warehouse at once.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"executions": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy_result(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        # Waiters copy call.result, so the leader mustn't hand out the original
+        return copy_result(call.result) if shared else call.result
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
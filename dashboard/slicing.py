@@ -0,0 +1,30 @@
+import pandas as pd
+
+
+class StateIndex:
+    """Rows of a frame pre-split by STATE so a drill-down is a dict lookup.
+
+    Built once per frame; `slice()` returns a copy of the selected state's
+    rows without the STATE column, in the order given by `sort_by`.
+    """
+
+    def __init__(self, frame, sort_by=None, ascending=True, key="STATE"):
+        self.columns = [c for c in frame.columns if c != key]
+        self._empty = frame.iloc[0:0][self.columns]
+        self._slices = {}
+        for state, rows in frame.groupby(key, sort=False, observed=True):
+            rows = rows[self.columns].copy()
+            # Categorical columns keep every category of the full frame; drop
+            # the ones this state doesn't have so pivots don't grow empty rows
+            for column in self.columns:
+                if isinstance(rows[column].dtype, pd.CategoricalDtype):
+                    rows[column] = rows[column].cat.remove_unused_categories()
+            if sort_by is not None:
+                rows = rows.sort_values(sort_by, ascending=ascending)
+            self._slices[state] = rows.reset_index(drop=True)
+
+    def states(self):
+        return sorted(self._slices)
+
+    def slice(self, state):
+        return self._slices.get(state, self._empty).copy()
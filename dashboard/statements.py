@@ -0,0 +1,88 @@
+import threading
+
+from dashboard.result_cache import normalize_sql
+
+# Every statement uses qmark placeholders. The Snowflake connection is opened
+# with paramstyle="qmark" so values are bound server-side: the SQL text stays
+# identical for every value, which is what lets Snowflake reuse the compiled
+# plan and its 24h result cache. SQLite uses the same placeholder style.
+PARAMSTYLE = "qmark"
+
+
+class Statement:
+    """A named, pre-normalised SQL statement plus its execution timings.
+
+    The first execution of a statement pays for parsing and planning; later
+    executions of the identical text can hit the server's plan/result caches
+    (or SQLite's statement cache). The execution timings are client-side
+    wall clock, compile time included; on Snowflake the compile time itself
+    is read back from the query history afterwards (see
+    dashboard/compile_times.py) and reported separately as compile_ms.
+    """
+
+    def __init__(self, name, sql, columns):
+        self.name = name
+        self.sql = normalize_sql(sql)
+        self.columns = list(columns)
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.first_ms = None
+        self.total_ms = 0.0
+        self.compiles = 0
+        self.compile_total_ms = 0.0
+
+    def record(self, elapsed_ms):
+        with self._lock:
+            if self.first_ms is None:
+                self.first_ms = elapsed_ms
+            self.executions += 1
+            self.total_ms += elapsed_ms
+
+    def record_compile(self, compile_ms):
+        with self._lock:
+            self.compiles += 1
+            self.compile_total_ms += compile_ms
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "executions": self.executions,
+                "first_ms": self.first_ms,
+                "mean_ms": self.total_ms / self.executions if self.executions else None,
+                "compile_ms": self.compile_total_ms / self.compiles if self.compiles else None,
+            }
+
+
+class StatementRegistry:
+    def __init__(self):
+        self._statements = {}
+        self._lock = threading.Lock()
+
+    # Registering the same name twice is fine as long as the SQL matches,
+    # so modules can register their statements at import time.
+    def register(self, name, sql, columns):
+        statement = Statement(name, sql, columns)
+        with self._lock:
+            existing = self._statements.get(name)
+            if existing is not None:
+                if existing.sql != statement.sql or existing.columns != statement.columns:
+                    raise ValueError(f"statement {name!r} is already registered with different SQL")
+                return existing
+            self._statements[name] = statement
+            return statement
+
+    def __getitem__(self, name):
+        return self._statements[name]
+
+    def __contains__(self, name):
+        return name in self._statements
+
+    def stats(self):
+        with self._lock:
+            registered = list(self._statements.values())
+        return [s.stats() for s in registered]
+
+
+# Process-wide registry shared by every page
+statements = StatementRegistry()
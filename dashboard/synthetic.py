@@ -0,0 +1,136 @@
+"""Synthetic ALL_STATE_COMBINED rows for the local stand-in backends.
+
+Row counts per state follow population, with Kaiser Permanente's regions
+boosted; categories and negotiated types have a long tail; and a small share
+of each column is NULL so the NULL-aware rollups are exercised.
+
+    python -m dashboard.synthetic --rows 10000000 --engine duckdb
+"""
+import argparse
+import itertools
+import random
+import time
+
+# Approximate 2020 census population (millions)
+STATE_POPULATION = {
+    'Alabama': 5.0, 'Alaska': 0.7, 'Arizona': 7.2, 'Arkansas': 3.0,
+    'California': 39.5, 'Colorado': 5.8, 'Connecticut': 3.6, 'Delaware': 1.0,
+    'Florida': 21.5, 'Georgia': 10.7, 'Hawaii': 1.5, 'Idaho': 1.8,
+    'Illinois': 12.8, 'Indiana': 6.8, 'Iowa': 3.2, 'Kansas': 2.9,
+    'Kentucky': 4.5, 'Louisiana': 4.7, 'Maine': 1.4, 'Maryland': 6.2,
+    'Massachusetts': 7.0, 'Michigan': 10.1, 'Minnesota': 5.7, 'Mississippi': 3.0,
+    'Missouri': 6.2, 'Montana': 1.1, 'Nebraska': 2.0, 'Nevada': 3.1,
+    'New Hampshire': 1.4, 'New Jersey': 9.3, 'New Mexico': 2.1, 'New York': 20.2,
+    'North Carolina': 10.4, 'North Dakota': 0.8, 'Ohio': 11.8, 'Oklahoma': 4.0,
+    'Oregon': 4.2, 'Pennsylvania': 13.0, 'Rhode Island': 1.1, 'South Carolina': 5.1,
+    'South Dakota': 0.9, 'Tennessee': 6.9, 'Texas': 29.1, 'Utah': 3.3,
+    'Vermont': 0.6, 'Virginia': 8.6, 'Washington': 7.7, 'West Virginia': 1.8,
+    'Wisconsin': 5.9, 'Wyoming': 0.6
+}
+
+# States with Kaiser Permanente regions carry far more records
+KAISER_STATES = {'California', 'Colorado', 'Georgia', 'Hawaii', 'Maryland', 'Oregon', 'Virginia', 'Washington'}
+KAISER_BOOST = 5.0
+
+CATEGORY_WEIGHTS = {
+    'Injection': 45, 'Gel': 25, 'Patch': 10, 'Pellet': 8,
+    'Cream': 5, 'Solution': 4, 'Capsule': 2, 'Other': 1
+}
+
+NEGOTIATED_TYPE_WEIGHTS = {'negotiated': 60, 'percentage': 20, 'per diem': 12, 'derived': 8}
+
+# Share of rows with a NULL in each column
+NULL_RATES = {"STATE": 0.005, "CATEGORY": 0.02, "NEGOTIATED_TYPE": 0.01}
+
+
+def state_weights():
+    return {
+        state: pop * (KAISER_BOOST if state in KAISER_STATES else 1.0)
+        for state, pop in STATE_POPULATION.items()
+    }
+
+
+# (values, cumulative weights) for one column, with None standing in for NULL
+def _distribution(weights, null_rate):
+    total = sum(weights.values())
+    values = [None] + list(weights)
+    probs = [null_rate] + [(1 - null_rate) * w / total for w in weights.values()]
+    return values, list(itertools.accumulate(probs))
+
+
+def distributions():
+    return [
+        _distribution(state_weights(), NULL_RATES["STATE"]),
+        _distribution(CATEGORY_WEIGHTS, NULL_RATES["CATEGORY"]),
+        _distribution(NEGOTIATED_TYPE_WEIGHTS, NULL_RATES["NEGOTIATED_TYPE"]),
+    ]
+
+
+# Yield lists of (STATE, CATEGORY, NEGOTIATED_TYPE) tuples, chunk_rows at a time
+def generate_rows(rows, seed=0, chunk_rows=500_000):
+    rng = random.Random(seed)
+    dists = distributions()
+    for start in range(0, rows, chunk_rows):
+        k = min(chunk_rows, rows - start)
+        columns = [rng.choices(values, cum_weights=cum, k=k) for values, cum in dists]
+        yield list(zip(*columns))
+
+
+def _create_table(conn):
+    conn.execute("DROP TABLE IF EXISTS ALL_STATE_COMBINED")
+    conn.execute("CREATE TABLE ALL_STATE_COMBINED (STATE VARCHAR, CATEGORY VARCHAR, NEGOTIATED_TYPE VARCHAR)")
+
+
+# Replace ALL_STATE_COMBINED with `rows` synthetic rows through any DB-API connection
+def seed_rows(conn, rows, seed=0, chunk_rows=500_000):
+    _create_table(conn)
+    for chunk in generate_rows(rows, seed=seed, chunk_rows=chunk_rows):
+        conn.executemany("INSERT INTO ALL_STATE_COMBINED VALUES (?, ?, ?)", chunk)
+    conn.commit()
+
+
+def _sql_literal(value):
+    return "NULL" if value is None else "'" + value.replace("'", "''") + "'"
+
+
+# DuckDB can generate the rows itself, which is what makes 100M+ row tables
+# practical: each column is a random draw matched against a table of
+# cumulative-probability buckets.
+def seed_duckdb(conn, rows, seed=0):
+    buckets = []
+    for name, (values, cum) in zip(["state_w", "category_w", "type_w"], distributions()):
+        lows = [0.0] + cum[:-1]
+        highs = cum[:-1] + [1.0]
+        body = ", ".join(f"({_sql_literal(v)}, {lo!r}, {hi!r})" for v, lo, hi in zip(values, lows, highs))
+        buckets.append(f"{name}(value, lo, hi) AS (SELECT * FROM (VALUES {body}))")
+    conn.execute("SELECT setseed(?)", [(seed % 1000) / 1000])
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE ALL_STATE_COMBINED AS
+        WITH {", ".join(buckets)},
+        draws AS (SELECT random() AS rs, random() AS rc, random() AS rt FROM range({int(rows)}))
+        SELECT s.value AS STATE, c.value AS CATEGORY, t.value AS NEGOTIATED_TYPE
+        FROM draws
+        JOIN state_w s ON draws.rs >= s.lo AND draws.rs < s.hi
+        JOIN category_w c ON draws.rc >= c.lo AND draws.rc < c.hi
+        JOIN type_w t ON draws.rt >= t.lo AND draws.rt < t.hi
+    """)
+
+
+def main():
+    from dashboard.backends import local_backend
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows to generate (default 1M)")
+    parser.add_argument("--engine", choices=["duckdb", "sqlite"], help="default: duckdb if installed, else sqlite")
+    parser.add_argument("--path", default=None, help="database file (default: DASHBOARD_LOCAL_DB or local_all_states.<engine>)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backend = local_backend(engine=args.engine, path=args.path)
+    start = time.perf_counter()
+    backend.seed(args.rows, seed=args.seed)
+    print(f"seeded {args.rows:,} rows into {backend.path} ({backend.name}) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
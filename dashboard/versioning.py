@@ -0,0 +1,173 @@
+"""Change detection for ALL_STATE_COMBINED and the summary table the pages
+read from.
+
+A cheap probe reads the tables' version: LAST_ALTERED and ROW_COUNT of both
+from INFORMATION_SCHEMA.TABLES on Snowflake (metadata only, no warehouse
+scan), or, on the local stand-ins, which have no such view, COUNT(*) plus
+the newest watermark value (DASHBOARD_SUMMARY_WATERMARK) of the raw table
+and the summary's REFRESHED_AT from its metadata table. Refreshing the
+summary therefore changes the version even when the raw table hasn't. The
+probe runs at most once per `interval` seconds, off the request path, and
+its result is hashed into a short fingerprint. dashboard.data tags every
+cached result with that fingerprint, so results are reused until either
+table changes rather than on a timer; once one does, the previous result
+is served while the new one is computed in the background.
+"""
+import hashlib
+import logging
+import threading
+import time
+
+from dashboard.backends import SNOWFLAKE_SCHEMA
+from dashboard.rollups import SOURCE_TABLE, SUMMARY_META, SUMMARY_STATE_CATEGORY_TYPE, WATERMARK_COLUMN, is_missing_table
+from dashboard.statements import statements
+
+logger = logging.getLogger(__name__)
+
+VERSION_COLUMNS = ["LAST_ALTERED", "ROW_COUNT"]
+
+INFORMATION_SCHEMA_PROBE = statements.register("table_version", """
+    SELECT TABLE_NAME, LAST_ALTERED, ROW_COUNT
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = ? AND TABLE_NAME IN (?, ?)
+    ORDER BY TABLE_NAME
+""", ["TABLE_NAME"] + VERSION_COLUMNS)
+
+# When the local summary tables were last rebuilt (see dashboard/rollups.py)
+SUMMARY_PROBE = statements.register("summary_version_local", f"""
+    SELECT MAX(REFRESHED_AT) AS LAST_ALTERED, MAX(SOURCE_ROWS) AS ROW_COUNT
+    FROM {SUMMARY_META}
+""", VERSION_COLUMNS)
+
+
+def local_probe(watermark_column=WATERMARK_COLUMN):
+    latest = f"MAX({watermark_column})" if watermark_column else "NULL"
+    return statements.register("table_version_local", f"""
+        SELECT {latest} AS LAST_ALTERED, COUNT(*) AS ROW_COUNT
+        FROM {SOURCE_TABLE}
+    """, VERSION_COLUMNS)
+
+
+# Hash of every probe's rows; None stands for a summary that isn't built yet
+def fingerprint(frames):
+    rows = [None if frame is None else frame.values.tolist() for frame in frames]
+    return hashlib.sha1(repr(rows).encode()).hexdigest()[:16]
+
+
+class TableVersion:
+    """Fingerprint of ALL_STATE_COMBINED and its summary, re-probed every
+    `interval` seconds.
+
+    `fetch(statement, params)` runs a probe statement and returns a frame.
+    The INFORMATION_SCHEMA probe is tried first and the local ones if it
+    fails; whichever worked is tried first from then on. If every probe
+    fails the last fingerprint is kept (None if there never was one, which
+    callers treat as "unknown" and fall back to TTLs). Only one thread
+    probes at a time; the others get the current fingerprint without
+    waiting, except during the very first probe, when there is none yet
+    and they wait for it.
+
+    With `spawn`, current() only waits for the very first probe: later ones
+    are handed to `spawn(fn)` to run in the background while it returns the
+    fingerprint it already has. Without it every probe runs in the caller.
+    """
+
+    def __init__(self, fetch, interval=60, clock=time.monotonic, spawn=None):
+        self._fetch = fetch
+        self.interval = interval
+        self._clock = clock
+        self._spawn = spawn
+        self._lock = threading.Lock()
+        self._probing = False
+        self._first_probe = threading.Event()
+        self._fingerprint = None
+        self._checked_at = None
+        # Each probe is a list of statements; the first reads the raw table
+        # and must return a row, the rest read the summary's state
+        self._probes = [
+            [(INFORMATION_SCHEMA_PROBE, [SNOWFLAKE_SCHEMA, SOURCE_TABLE, SUMMARY_STATE_CATEGORY_TYPE])],
+            [(local_probe(), None), (SUMMARY_PROBE, None)],
+        ]
+        self._stats = {"probes": 0, "changes": 0, "failures": 0}
+
+    def _read(self, probe):
+        frames = []
+        for statement, params in probe:
+            try:
+                frames.append(self._fetch(statement, params))
+            except Exception as exc:
+                # No summary yet is a state of its own, not a failed probe
+                if not frames or not is_missing_table(exc):
+                    raise
+                frames.append(None)
+        return frames
+
+    def _probe(self):
+        for i, probe in enumerate(self._probes):
+            try:
+                frames = self._read(probe)
+            except Exception:
+                logger.debug("table version probe %s failed", probe[0][0].name, exc_info=True)
+                continue
+            if len(frames[0]):
+                if i:
+                    self._probes.insert(0, self._probes.pop(i))
+                return fingerprint(frames)
+        raise LookupError(f"no table version probe worked for {SOURCE_TABLE}")
+
+    # Probe now (unless another thread already is) and return the fingerprint
+    def check(self):
+        with self._lock:
+            probing = self._probing
+            if probing and self._checked_at is not None:
+                return self._fingerprint
+            self._probing = True
+        if probing:
+            self._first_probe.wait()
+            with self._lock:
+                return self._fingerprint
+        return self._check()
+
+    # The probe itself, once this thread has set _probing
+    def _check(self):
+        try:
+            value = self._probe()
+        except LookupError:
+            logger.warning("could not read the version of %s; keeping the last one", SOURCE_TABLE)
+            value = None
+        with self._lock:
+            self._probing = False
+            self._checked_at = self._clock()
+            self._stats["probes"] += 1
+            if value is None:
+                self._stats["failures"] += 1
+            else:
+                if self._fingerprint is not None and value != self._fingerprint:
+                    self._stats["changes"] += 1
+                    logger.info("%s changed: version %s -> %s", SOURCE_TABLE, self._fingerprint, value)
+                self._fingerprint = value
+            self._first_probe.set()
+            return self._fingerprint
+
+    def current(self):
+        with self._lock:
+            checked_at = self._checked_at
+            value = self._fingerprint
+            due = checked_at is None or self._clock() - checked_at >= self.interval
+            background = due and checked_at is not None and self._spawn is not None and not self._probing
+            if background:
+                self._probing = True
+        if background:
+            try:
+                self._spawn(self._check)
+            except Exception:
+                with self._lock:
+                    self._probing = False
+                raise
+        elif due:
+            value = self.check()
+        return value
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, fingerprint=self._fingerprint, interval=self.interval)
@@ -0,0 +1,132 @@
+"""Pre-load the aggregate cube, the state list and every section's map.
+
+Inside the server, start_background_warmup() runs this once per process on
+a background thread as soon as the first session starts, so the other
+sections are ready before anybody opens them. From the command line it
+resumes the warehouse and fills its result cache, which is worth running
+right after a deploy. The maps only depend on the cube and the state list,
+not on each other, so once those two are loaded the three maps are built
+concurrently on the query executor (see dashboard/executor.py):
+
+    python -m dashboard.warmup
+"""
+import argparse
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_started = False
+_start_lock = threading.Lock()
+
+# Per-item results of the most recent warmup in this process
+last_results = []
+
+
+# (name, call) items in stages; a stage starts once the one before it is
+# done, and the items within a stage run concurrently
+def _stages():
+    # Imported here so importing this module stays cheap for the Home page
+    from dashboard.data import get_catalog, load_cube
+    from dashboard.pages import category, heatmap, negotiated_type
+
+    return [
+        [("aggregate cube", load_cube)],
+        [("state list", lambda: get_catalog().refresh())],
+        [
+            ("Heatmap Overview map", heatmap.national_figure),
+            ("Category Analytics map", category.national_figure),
+            ("Negotiated Type Breakdown map", negotiated_type.national_figure),
+        ],
+    ]
+
+
+def _warm(name, call):
+    start = time.perf_counter()
+    error = None
+    try:
+        call()
+    except Exception as exc:
+        error = repr(exc)
+        logger.exception("warmup of %s failed", name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info("warmed %s in %.1f ms", name, elapsed_ms)
+    return {"item": name, "ms": elapsed_ms, "error": error}
+
+
+# `call` wrapped to run with the caller's script context attached to whichever
+# executor thread picks it up, and detached again afterwards
+def _in_script_context(call):
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def run():
+        thread = threading.current_thread()
+        previous = get_script_run_ctx(suppress_warning=True)
+        add_script_run_ctx(thread, ctx)
+        try:
+            return call()
+        finally:
+            add_script_run_ctx(thread, previous)
+
+    return run
+
+
+def warm_up():
+    """Warm every item, stage by stage; returns a list of {item, ms, error}
+    dicts. `ms` is each item's own time, so within a stage they overlap.
+
+    A failing item is logged and recorded but does not stop the rest.
+    """
+    from dashboard.executor import gather
+
+    global last_results
+    results = []
+    for stage in _stages():
+        if len(stage) == 1:
+            results.append(_warm(*stage[0]))
+        else:
+            results.extend(gather([
+                _in_script_context(lambda name=name, call=call: _warm(name, call)) for name, call in stage
+            ]))
+    last_results = results
+    return results
+
+
+# Start warm_up() on a daemon thread, at most once per process. The thread
+# borrows the calling script's context so st.cache_resource lookups made
+# from it behave as they would on the script thread.
+def start_background_warmup():
+    global _started
+    with _start_lock:
+        if _started:
+            return None
+        _started = True
+
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+    thread = threading.Thread(target=warm_up, name="dashboard-warmup", daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    start = time.perf_counter()
+    results = warm_up()
+    wall_ms = (time.perf_counter() - start) * 1000
+    for result in results:
+        status = "ok" if result["error"] is None else f"FAILED {result['error']}"
+        print(f"{result['item']:<32} {result['ms']:9.1f} ms  {status}")
+    print(f"{'total (wall clock)':<32} {wall_ms:9.1f} ms")
+    raise SystemExit(1 if any(r["error"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
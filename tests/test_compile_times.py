@@ -0,0 +1,63 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from dashboard.compile_times import COMPILE_TIMES, HISTORY_WINDOW_S, collect_compile_times
+from dashboard.instrumentation import QueryLog
+from dashboard.statements import StatementRegistry
+
+
+def history(*rows):
+    return pd.DataFrame(rows, columns=COMPILE_TIMES.columns)
+
+
+@pytest.fixture
+def registry():
+    registry = StatementRegistry()
+    registry.register("by_state", "SELECT 1", ["N"])
+    return registry
+
+
+def test_compile_times_are_credited_to_their_statements(registry):
+    log = QueryLog()
+    first = log.record(statement="by_state", query_id="q1", at=0)
+    second = log.record(statement="by_state", query_id="q2", at=0)
+    local = log.record(statement="by_state", query_id=None, at=0)
+    fetched = []
+
+    def fetch(statement):
+        fetched.append(statement)
+        return history(("q1", 120), ("q2", 30), ("other", 999))
+
+    assert collect_compile_times(fetch, log, registry, clock=lambda: 10) == 2
+    assert fetched == [COMPILE_TIMES]
+    assert (first["compile_ms"], second["compile_ms"]) == (120.0, 30.0)
+    assert "compile_ms" not in local
+    assert registry["by_state"].stats()["compile_ms"] == 75.0
+
+    # Nothing left to look up: no second history query
+    assert collect_compile_times(fetch, log, registry, clock=lambda: 10) == 0
+    assert len(fetched) == 1
+
+
+def test_queries_missing_from_the_history_are_retried_until_the_window_passes(registry):
+    log = QueryLog()
+    record = log.record(statement="by_state", query_id="q1", at=0)
+    running = lambda statement: history(("q1", None))
+
+    assert collect_compile_times(running, log, registry, clock=lambda: 10) == 0
+    assert "compile_ms" not in record
+    assert collect_compile_times(running, log, registry, clock=lambda: HISTORY_WINDOW_S + 1) == 0
+    assert record["compile_ms"] is None
+    assert registry["by_state"].stats()["compile_ms"] is None
+
+
+def test_without_query_ids_the_history_is_never_queried(registry):
+    log = QueryLog()
+    log.record(statement="by_state", query_id=None)
+    log.record(statement=COMPILE_TIMES.name, query_id="own")
+
+    def fetch(statement):
+        raise AssertionError("no query_id to look up")
+
+    assert collect_compile_times(fetch, log, registry) == 0
@@ -0,0 +1,58 @@
+import os
+import threading
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from dashboard.disk_cache import DiskCache
+
+
+def frame(n):
+    return pd.DataFrame({"STATE": [f"S{i}" for i in range(n)], "ENTRY_COUNT": list(range(n))})
+
+
+def test_round_trip_at_the_same_version(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("cube", frame(3), "v1")
+    assert cache.get("cube", "v1")["ENTRY_COUNT"].tolist() == [0, 1, 2]
+    assert cache.get("cube", "v2") is None
+
+
+def test_unknown_version_uses_max_age(tmp_path):
+    now = [1000.0]
+    cache = DiskCache(str(tmp_path), max_age=60, clock=lambda: now[0])
+    cache.put("cube", frame(1), None)
+    assert cache.get("cube", None) is not None
+    now[0] += 61
+    assert cache.get("cube", None) is None
+
+
+def test_processes_sharing_the_directory_keep_each_others_entries(tmp_path):
+    first, second = DiskCache(str(tmp_path)), DiskCache(str(tmp_path))
+    first.put("cube", frame(2), "v1")
+    second.put("types", frame(4), "v1")
+    assert len(first.get("types", "v1")) == 4
+    assert len(second.get("cube", "v1")) == 2
+
+
+def test_concurrent_writers_leave_one_whole_file(tmp_path):
+    caches = [DiskCache(str(tmp_path)) for _ in range(8)]
+    barrier = threading.Barrier(len(caches))
+
+    def write(i):
+        barrier.wait()
+        caches[i].put("cube", frame(100 + i), f"v{i}")
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(len(caches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(os.listdir(tmp_path)) == ["cube.arrow"]
+    winners = [i for i in range(len(caches)) if caches[0].get("cube", f"v{i}") is not None]
+    assert len(winners) == 1
+    assert len(caches[0].get("cube", f"v{winners[0]}")) == 100 + winners[0]
+    assert sum(c.stats()["errors"] for c in caches) == 0
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+from dashboard.fetch import cursor_to_frame
+
+COLUMNS = ["STATE", "ENTRY_COUNT"]
+
+
+class ArrowCursor:
+    """Yields its result like a Snowflake cursor: one pyarrow.Table per chunk."""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def fetch_arrow_batches(self):
+        return iter(self.tables)
+
+    def fetchall(self):
+        raise AssertionError("the Arrow path should not fall back to fetchall()")
+
+
+def test_arrow_tables_from_the_cursor_become_one_frame():
+    cur = ArrowCursor([
+        pa.table({"state": ["CA", "NY"], "n": [3, 2]}),
+        pa.table({"state": ["TX"], "n": [1]}),
+    ])
+    timings = {}
+    frame = cursor_to_frame(cur, COLUMNS, timings)
+    assert frame["STATE"].tolist() == ["CA", "NY", "TX"]
+    assert frame["ENTRY_COUNT"].tolist() == [3, 2, 1]
+    assert str(frame["STATE"].dtype) == "category"
+    assert timings["result_bytes"] > 0
+
+
+def test_an_empty_arrow_result_is_an_empty_frame():
+    class EmptyCursor(ArrowCursor):
+        def fetchall(self):
+            return []
+
+    frame = cursor_to_frame(EmptyCursor([]), COLUMNS)
+    assert list(frame.columns) == COLUMNS
+    assert len(frame) == 0
@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from dashboard.pool import ConnectionPool, PoolTimeout
+
+
+class TokenExpired(Exception):
+    errno = 390114
+
+
+def sqlite_connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_reuses_the_idle_connection():
+    pool = ConnectionPool(sqlite_connect, size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["reused"] == 1
+
+
+def test_evicts_connections_idle_longer_than_max_idle(clock):
+    pool = ConnectionPool(sqlite_connect, size=2, max_idle=10, clock=clock)
+    with pool.connection():
+        pass
+    clock.now = 5
+    assert pool.evict_idle() == 0
+    clock.now = 20
+    assert pool.evict_idle() == 1
+    assert pool.stats()["open"] == 0
+
+
+def test_idle_connections_are_evicted_without_traffic(clock):
+    pool = ConnectionPool(sqlite_connect, size=2, max_idle=10, clock=clock)
+    with pool.connection():
+        pass
+    clock.now = 20
+    pool.evict_periodically(0.01)
+    deadline = time.monotonic() + 2
+    while pool.stats()["open"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pool.close()
+    assert pool.stats()["open"] == 0
+    assert pool.stats()["evicted"] == 1
+
+
+def test_recycles_connections_past_max_lifetime(clock):
+    pool = ConnectionPool(sqlite_connect, size=1, max_idle=100, max_lifetime=50, clock=clock)
+    with pool.connection() as first:
+        pass
+    clock.now = 60
+    with pool.connection() as second:
+        pass
+    assert first is not second
+    assert pool.stats()["evicted"] == 1
+
+
+def test_acquire_times_out_when_every_connection_is_leased():
+    pool = ConnectionPool(sqlite_connect, size=1, timeout=0.05)
+    entry = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(entry)
+    pool.release(pool.acquire())
+
+
+def test_release_wakes_a_waiting_caller():
+    pool = ConnectionPool(sqlite_connect, size=1, timeout=5)
+    entry = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    pool.release(entry)
+    waiter.join(5)
+    assert got and got[0] is entry
+
+
+def test_run_reconnects_once_on_token_expiry():
+    pool = ConnectionPool(sqlite_connect, size=2)
+    seen = []
+
+    def fn(conn):
+        seen.append(conn)
+        if len(seen) == 1:
+            raise TokenExpired()
+        return "ok"
+
+    assert pool.run(fn) == "ok"
+    assert seen[0] is not seen[1]
+    assert pool.stats()["reconnects"] == 1
+    assert pool.stats()["open"] == 1
+
+
+def test_connection_error_forces_a_health_check_before_reuse(clock):
+    pool = ConnectionPool(sqlite_connect, size=1, check_after=60, clock=clock)
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as conn:
+            conn.close()
+            # Any connection-level error marks the connection as suspect
+            raise sqlite3.OperationalError("connection dropped")
+    # The closed connection fails its check and is replaced, well before check_after
+    with pool.connection() as fresh:
+        fresh.execute("SELECT 1")
+    assert fresh is not conn
+    assert pool.stats()["failed_checks"] == 1
+
+
+def test_healthy_connection_survives_a_statement_error():
+    pool = ConnectionPool(sqlite_connect, size=1)
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as conn:
+            conn.execute("SELECT * FROM no_such_table")
+    with pool.connection() as again:
+        pass
+    assert again is conn
+    assert pool.stats()["failed_checks"] == 0
+
+
+def test_an_interrupted_lease_is_released():
+    pool = ConnectionPool(sqlite_connect, size=1, timeout=0.1)
+    with pytest.raises(KeyboardInterrupt):
+        with pool.connection() as conn:
+            raise KeyboardInterrupt
+    assert pool.stats()["idle"] == 1
+    # Handed out again (after a health check) rather than timing out
+    with pool.connection() as again:
+        pass
+    assert again is conn
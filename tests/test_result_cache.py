@@ -0,0 +1,70 @@
+from dashboard.result_cache import ResultCache
+
+
+class Spawner:
+    """Collects spawned refreshes so the test decides when they run."""
+
+    def __init__(self):
+        self.pending = []
+
+    def __call__(self, fn):
+        self.pending.append(fn)
+
+    def run(self):
+        pending, self.pending = self.pending, []
+        for fn in pending:
+            fn()
+
+
+def test_only_a_cold_miss_waits_for_compute():
+    cache = ResultCache()
+    spawn = Spawner()
+    value, _, version = cache.get_or_revalidate("SELECT 1", None, lambda: [1], spawn=spawn, version="v1")
+    assert (value, version) == ([1], "v1")
+    assert spawn.pending == []
+
+
+def test_a_new_version_serves_the_previous_result_while_it_refreshes():
+    cache = ResultCache()
+    spawn = Spawner()
+    cache.get_or_revalidate("SELECT 1", None, lambda: [1], spawn=spawn, version="v1")
+
+    value, _, version = cache.get_or_revalidate("SELECT 1", None, lambda: [2], spawn=spawn, version="v2")
+    assert (value, version) == ([1], "v1")
+    # One refresh per key, however many requests arrive while it runs
+    cache.get_or_revalidate("SELECT 1", None, lambda: [2], spawn=spawn, version="v2")
+    assert len(spawn.pending) == 1
+
+    spawn.run()
+    value, _, version = cache.get_or_revalidate("SELECT 1", None, lambda: [3], spawn=spawn, version="v2")
+    assert (value, version) == ([2], "v2")
+    assert spawn.pending == []
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_expired_entries_are_served_stale_while_they_refresh(clock):
+    cache = ResultCache(ttl=10, clock=clock)
+    spawn = Spawner()
+    cache.get_or_revalidate("SELECT 1", None, lambda: [1], spawn=spawn)
+    clock.now = 11
+    value, _, _ = cache.get_or_revalidate("SELECT 1", None, lambda: [2], spawn=spawn)
+    assert value == [1]
+    spawn.run()
+    assert cache.get_or_revalidate("SELECT 1", None, lambda: [3], spawn=spawn)[0] == [2]
+
+
+def test_a_failed_refresh_keeps_the_stale_result():
+    cache = ResultCache()
+    spawn = Spawner()
+    cache.get_or_revalidate("SELECT 1", None, lambda: [1], spawn=spawn, version="v1")
+
+    def fail():
+        raise RuntimeError("warehouse unavailable")
+
+    cache.get_or_revalidate("SELECT 1", None, fail, spawn=spawn, version="v2")
+    spawn.run()
+    value, _, version = cache.get_or_revalidate("SELECT 1", None, lambda: [2], spawn=spawn, version="v2")
+    assert (value, version) == ([1], "v1")
+    assert cache.stats()["refresh_errors"] == 1
+    # The next request retries
+    assert len(spawn.pending) == 1
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from benchmarks import burst
+from dashboard import executor
+from dashboard.result_cache import ResultCache
+from dashboard.singleflight import SingleFlight
+from dashboard.statements import statements
+
+BY_STATE = statements.register("test_by_state", """
+    SELECT STATE, COUNT(*) AS ENTRY_COUNT FROM ALL_STATE_COMBINED GROUP BY STATE
+""", ["STATE", "ENTRY_COUNT"])
+
+
+class StubCursor:
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchall(self):
+        return [("CA", 3), ("NY", 2)]
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    def cursor(self):
+        return StubCursor()
+
+
+class SlowPool:
+    """Stands in for the connection pool; every statement takes `delay` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def run(self, fn):
+        time.sleep(self.delay)
+        return fn(StubConnection())
+
+
+@pytest.fixture
+def executions(monkeypatch):
+    # Only the cache's own coalescing may keep the count at one
+    monkeypatch.setattr(executor, "SINGLE_FLIGHT", False)
+    calls = []
+    execute_statement = executor.execute_statement
+
+    def counting(pool, statement, params=None):
+        calls.append(statement.name)
+        return execute_statement(pool, statement, params)
+
+    monkeypatch.setattr(executor, "execute_statement", counting)
+    return calls
+
+
+def test_concurrent_cold_misses_run_the_statement_once(executions):
+    cache = ResultCache()
+    pool = SlowPool(delay=0.2)
+
+    def lookup():
+        return cache.get_or_revalidate(BY_STATE.sql, None, lambda: executor.run_statement(pool, BY_STATE))
+
+    results, errors = burst(lookup, 20)
+
+    assert errors == []
+    assert executions == ["test_by_state"]
+    frames = [frame for frame, _, _ in results]
+    assert all(f["ENTRY_COUNT"].tolist() == [3, 2] for f in frames)
+    # Every session got its own copy
+    assert len({id(f) for f in frames}) == len(frames)
+
+
+def test_waiters_share_the_leaders_error():
+    flight = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.2)
+        raise RuntimeError("warehouse unavailable")
+
+    results, errors = burst(lambda: flight.do("key", fail), 10)
+    assert len(calls) == 1
+    assert len(errors) == 10
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from dashboard.pivot import load_types_by_state
+from dashboard.rollups import SOURCE_TABLE, is_missing_table
+
+
+class ObjectDoesNotExist(Exception):
+    errno = 2003
+
+
+class Frame:
+    def rename(self, columns):
+        return columns
+
+
+def sqlite_error(sql):
+    try:
+        sqlite3.connect(":memory:").execute(sql)
+    except sqlite3.Error as exc:
+        return exc
+    raise AssertionError("statement did not fail")
+
+
+def test_missing_tables_are_recognised():
+    assert is_missing_table(sqlite_error("SELECT * FROM ALL_STATE_SUMMARY_STATE_CATEGORY_TYPE"))
+    assert is_missing_table(ObjectDoesNotExist("SQL compilation error"))
+
+
+def test_other_errors_are_not_missing_tables():
+    assert not is_missing_table(sqlite_error("SELEC 1"))
+    assert not is_missing_table(sqlite3.OperationalError("database is locked"))
+    assert not is_missing_table(TimeoutError("statement timed out"))
+
+
+def test_pivot_falls_back_to_the_raw_table_when_the_summary_is_missing():
+    tables = []
+
+    def fetch(statement, params):
+        tables.append(SOURCE_TABLE in statement.sql)
+        if not tables[-1]:
+            raise ObjectDoesNotExist("Object 'ALL_STATE_SUMMARY_STATE_CATEGORY_TYPE' does not exist")
+        return Frame()
+
+    load_types_by_state(fetch, ["FFS"])
+    assert tables == [False, True]
+
+
+def test_pivot_does_not_mask_other_errors():
+    calls = []
+
+    def fetch(statement, params):
+        calls.append(statement)
+        raise sqlite3.OperationalError("database is locked")
+
+    with pytest.raises(sqlite3.OperationalError):
+        load_types_by_state(fetch, ["FFS"])
+    assert len(calls) == 1
@@ -0,0 +1,91 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from dashboard.fetch import rows_to_frame
+from dashboard.rollups import refresh_summaries
+from dashboard.synthetic import seed_rows
+from dashboard.versioning import TableVersion
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    seed_rows(conn, 500, seed=0)
+    return conn
+
+
+def table_version(conn, spawn=None):
+    def fetch(statement, params=None):
+        return rows_to_frame(conn.execute(statement.sql, params or []).fetchall(), statement.columns)
+
+    return TableVersion(fetch, interval=0, spawn=spawn)
+
+
+def test_version_without_a_summary_table(conn):
+    version = table_version(conn)
+    assert version.check() is not None
+    assert version.stats()["failures"] == 0
+
+
+def test_rebuilding_the_summary_changes_the_version(conn):
+    version = table_version(conn)
+    before = version.check()
+    refresh_summaries(conn, watermark_column=None, full=True)
+    built = version.check()
+    assert built != before
+    conn.execute("UPDATE ALL_STATE_SUMMARY_META SET REFRESHED_AT = 'later'")
+    assert version.check() != built
+    assert version.stats()["changes"] == 2
+
+
+def test_raw_table_changes_change_the_version(conn):
+    refresh_summaries(conn, watermark_column=None, full=True)
+    version = table_version(conn)
+    before = version.check()
+    conn.execute("DELETE FROM ALL_STATE_COMBINED WHERE rowid = 1")
+    assert version.check() != before
+
+
+def test_only_the_first_probe_runs_in_the_caller(conn):
+    spawned = []
+    version = table_version(conn, spawn=spawned.append)
+    first = version.current()
+    assert first is not None and spawned == []
+
+    conn.execute("DELETE FROM ALL_STATE_COMBINED WHERE rowid = 1")
+    assert version.current() == first
+    assert version.current() == first
+    assert len(spawned) == 1
+
+    spawned.pop()()
+    assert version.current() != first
+
+
+def test_callers_wait_for_the_first_probe(conn):
+    probing, release = threading.Event(), threading.Event()
+
+    def fetch(statement, params=None):
+        probing.set()
+        release.wait()
+        return rows_to_frame(conn.execute(statement.sql, params or []).fetchall(), statement.columns)
+
+    version = TableVersion(fetch, interval=60)
+    prober = threading.Thread(target=version.current)
+    prober.start()
+    probing.wait()
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(version.current()))
+    waiter.start()
+    time.sleep(0.05)
+    assert results == []
+    release.set()
+    prober.join()
+    waiter.join()
+    assert results[0] is not None
+    assert version.stats()["probes"] == 1